@@ -0,0 +1,36 @@
+from volatility_trader.__main__ import make_dummy_bars
+from volatility_trader.backtest import StrategyBacktester
+from volatility_trader.config import DEFAULT_CONFIG
+from volatility_trader.data import iter_day_chunks
+
+# Gates loose enough that the dummy walks trade
+LOOSE = DEFAULT_CONFIG.with_overrides({
+    "strategy_rules": {"required_rvol": 0.0, "required_atr_pct": 0.0, "reversal_rsi_max": 101},
+    "risk_rules": {"risk_fraction": 0.001},
+})
+
+
+def _data(days=300):
+    return {s: make_dummy_bars(s, days, seed=2) for s in ("AAA", "BBB", "CCC")}
+
+
+def _trades(result):
+    return [(t.symbol, t.entry_time, t.exit_time, t.pnl) for t in result.trades]
+
+
+def test_chunked_run_with_full_warmup_matches_full_mapping_run():
+    data = _data()
+    full = StrategyBacktester(100_000, respect_schedule=False, config=LOOSE).run(data)
+    assert full.trades
+    chunked = StrategyBacktester(100_000, respect_schedule=False, config=LOOSE).run(
+        iter_day_chunks(data), warmup_bars=1000
+    )
+    assert _trades(chunked) == _trades(full)
+    assert [(d.time, d.pnl) for d in chunked.dailies] == [(d.time, d.pnl) for d in full.dailies]
+
+
+def test_chunked_run_does_not_keep_replaced_histories_cached():
+    bt = StrategyBacktester(100_000, respect_schedule=False, config=LOOSE)
+    bt.run(iter_day_chunks(_data(600)), warmup_bars=250)
+    # Only contexts over the histories still being extended may stay cached
+    assert len(bt.context_cache) <= 3
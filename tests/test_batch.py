@@ -0,0 +1,33 @@
+import json
+
+from volatility_trader.__main__ import run_batch, run_job
+from volatility_trader.scanner import SignalContextCache
+
+
+def test_failing_jobs_are_reported_and_the_rest_still_run(tmp_path, capsys):
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(json.dumps({
+        "defaults": {"days": 260},
+        "jobs": [
+            {"name": "bad-resample", "resample": "7x"},
+            {"name": "typo", "equtiy": 50_000},
+            {"name": "baseline"},
+        ],
+    }))
+    assert run_batch(str(manifest)) == 2
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["name"] for line in lines] == ["bad-resample", "typo", "baseline"]
+    assert "Unknown timeframe" in lines[0]["error"]
+    assert lines[1]["error"] == "ValueError: Unknown job keys: equtiy"
+    assert "error" not in lines[2] and "sharpe_ratio" in lines[2]
+
+
+def test_jobs_share_bars_and_signal_contexts():
+    cache, contexts = {}, SignalContextCache()
+    first = run_job({"days": 260}, cache, contexts)
+    misses = contexts.misses
+    second = run_job({"days": 260, "equity": 50_000}, cache, contexts)
+    assert contexts.misses == misses
+    assert contexts.hits >= misses
+    assert second["days"] == first["days"]
+    assert run_job({"days": 260}, {}) == first
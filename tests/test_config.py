@@ -0,0 +1,17 @@
+import pytest
+
+from volatility_trader.config import DEFAULT_CONFIG, Config
+
+
+def test_configs_hash_by_their_rules():
+    tighter = DEFAULT_CONFIG.with_overrides({"risk_rules": {"max_positions": 1}})
+    assert hash(Config()) == hash(DEFAULT_CONFIG)
+    assert {DEFAULT_CONFIG: "default", tighter: "tighter"}[Config()] == "default"
+    assert tighter != DEFAULT_CONFIG
+
+
+def test_market_timezone_comes_from_the_schedule():
+    central = DEFAULT_CONFIG.with_overrides({"trading_schedule": {"timezone": "US/Central"}})
+    assert str(central.market_tz) == "US/Central"
+    with pytest.raises(TypeError):
+        Config(timezone="US/Central")
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from volatility_trader.execution import CLOSE_OUT, STOP, TARGET, BracketExit, solve_bracket_exit
+
+
+def _reference(last, volume, stop, target, start, end, close_out, participation):
+    # Bar-by-bar walk in the order check_open_orders and the close-out run
+    end = len(last) if end is None else min(end, len(last))
+    if close_out is not None:
+        close_out = max(close_out, start)
+    for i in range(start, end):
+        fillable = participation is None or int(volume[i] * participation) > 0
+        if fillable and stop is not None and last[i] <= stop:
+            return BracketExit(i, STOP)
+        if fillable and target is not None and last[i] >= target:
+            return BracketExit(i, TARGET)
+        if i == close_out:
+            return BracketExit(i, CLOSE_OUT)
+    return None
+
+
+def test_close_out_before_start_closes_at_start():
+    last = [100.0] * 100
+    last[77] = 90.0
+    volume = [1000.0] * 100
+    assert solve_bracket_exit(last, volume, 95.0, 110.0, start=77, close_out=23) == BracketExit(77, STOP)
+    assert solve_bracket_exit(last, volume, 80.0, 110.0, start=77, close_out=23) == BracketExit(77, CLOSE_OUT)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_bar_by_bar_walk(seed):
+    rng = random.Random(seed)
+    for _ in range(400):
+        n = rng.randint(1, 300)
+        last = [100 + rng.gauss(0, 3) for _ in range(n)]
+        volume = [rng.choice([0.0, 10.0, 1000.0]) for _ in range(n)]
+        args = (
+            last,
+            volume,
+            rng.choice([None, 100 - rng.uniform(0, 8)]),
+            rng.choice([None, 100 + rng.uniform(0, 8)]),
+            rng.randint(0, n),
+            rng.choice([None, rng.randint(0, n + 5)]),
+            rng.choice([None, rng.randint(0, n + 5)]),
+            rng.choice([None, 0.05, 0.5]),
+        )
+        assert solve_bracket_exit(*args) == _reference(*args)
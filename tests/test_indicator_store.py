@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from volatility_trader.__main__ import JOB_DEFAULTS, load_indicators, make_dummy_bars
+from volatility_trader.backtest import StrategyBacktester
+from volatility_trader.data import BarColumns
+from volatility_trader.indicator_store import COLUMNS, IndicatorStore, RollingIndicators, compute_indicator_arrays
+from volatility_trader.scanner import IndicatorParams, build_signal_context
+
+
+def test_arrays_are_bit_identical_to_build_signal_context():
+    bars = make_dummy_bars("XYZ", 320, seed=3)
+    arrays = compute_indicator_arrays(BarColumns.from_bars("XYZ", bars))
+    rolling = RollingIndicators("XYZ", keep=210)
+    for i, bar in enumerate(bars):
+        rolling.append(bar)
+        expected = build_signal_context(bars[:i + 1])
+        assert arrays.context_at(i) == expected
+        assert rolling.context() == expected
+
+
+def test_store_extends_a_stored_prefix(tmp_path):
+    bars = make_dummy_bars("XYZ", 320, seed=3)
+    store = IndicatorStore(str(tmp_path))
+    store.load("XYZ", BarColumns.from_bars("XYZ", bars[:250]))
+    extended = store.load("XYZ", BarColumns.from_bars("XYZ", bars))
+    assert store.stats() == {"hits": 0, "extended": 1, "misses": 1}
+    fresh = compute_indicator_arrays(BarColumns.from_bars("XYZ", bars))
+    for name in COLUMNS:
+        assert bytes(extended.columns[name]) == fresh.columns[name].tobytes()
+
+
+def test_longer_cli_range_reuses_the_shorter_ranges_file(tmp_path):
+    job = {**JOB_DEFAULTS, "symbols": ["XYZ"], "cache_dir": str(tmp_path)}
+    load_indicators({**job, "days": 250}, {"XYZ": make_dummy_bars("XYZ", 250)})
+    arrays = load_indicators({**job, "days": 300}, {"XYZ": make_dummy_bars("XYZ", 300)})["XYZ"]
+    assert len(os.listdir(tmp_path)) == 1
+    assert len(arrays) == 300
+
+
+def test_backtester_rejects_arrays_for_other_parameters():
+    bars = {"XYZ": make_dummy_bars("XYZ", 250)}
+    other = compute_indicator_arrays(BarColumns.from_bars("XYZ", bars["XYZ"]), IndicatorParams(rsi_period=7))
+    with pytest.raises(ValueError, match="other parameters"):
+        StrategyBacktester(100_000, respect_schedule=False).run(bars, indicators={"XYZ": other})
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from volatility_trader.indicators import bollinger, bollinger_bank
+
+
+def _drifting(n=20_000, seed=0, tick=None):
+    # Minute-like closes drifting from 99 to roughly 2.6x that
+    rng = random.Random(seed)
+    closes = [99.0]
+    for _ in range(n - 1):
+        closes.append(closes[-1] * (1 + rng.gauss(0.000047, 0.0005)))
+    return [round(c / tick) * tick for c in closes] if tick else closes
+
+
+def _widths(lower, upper):
+    return [(u - l) / l * 100 for l, u in zip(lower, upper)]
+
+
+def _squeezes(widths, lookback=20):
+    return [widths[i] <= min(widths[i - lookback + 1:i + 1]) for i in range(lookback - 1, len(widths))]
+
+
+def test_bank_matches_bollinger_on_a_long_drifting_series():
+    closes = _drifting()
+    settings = [(20, 2.0), (50, 2.5)]
+    lower, ma, upper = bollinger_bank(closes, settings)
+    for k, (period, num_std) in enumerate(settings):
+        ref_lower, ref_ma, ref_upper = bollinger(closes, period, num_std)
+        assert len(lower[k]) == len(ref_lower)
+        assert ma[k] == pytest.approx(ref_ma, rel=1e-12)
+        sds = [(u - m) / num_std for u, m in zip(upper[k], ma[k])]
+        ref_sds = [(u - m) / num_std for u, m in zip(ref_upper, ref_ma)]
+        assert sds == pytest.approx(ref_sds, rel=1e-9)
+        assert _squeezes(_widths(lower[k], upper[k])) == _squeezes(_widths(ref_lower, ref_upper))
+
+
+def test_windows_holding_the_same_values_get_the_same_band():
+    closes = _drifting(5_000, seed=1, tick=0.01)
+    lower, _, upper = bollinger_bank(closes, [(20, 2.0)])
+    repeats = [i for i in range(1, len(lower[0])) if closes[i + 19] == closes[i - 1]]
+    assert repeats
+    for i in repeats:
+        assert (lower[0][i], upper[0][i]) == (lower[0][i - 1], upper[0][i - 1])
+
+
+def test_flat_windows_have_zero_width():
+    closes = [100.0] * 30 + [101.0] * 30 + [250.0] * 30
+    lower, _, upper = bollinger_bank(closes, [(10, 2.0)])
+    ref_lower, _, ref_upper = bollinger(closes, 10, 2.0)
+    spreads = [u - l for l, u in zip(lower[0], upper[0])]
+    ref_spreads = [u - l for l, u in zip(ref_lower, ref_upper)]
+    assert [s == 0 for s in spreads] == [s == 0 for s in ref_spreads]
+    assert spreads == pytest.approx(ref_spreads, rel=1e-9)
@@ -0,0 +1,67 @@
+import pytest
+
+from volatility_trader.__main__ import make_dummy_bars
+from volatility_trader.backtest import StrategyBacktester
+from volatility_trader.config import DEFAULT_CONFIG
+from volatility_trader.journal import JournalWriter, replay
+from volatility_trader.types import Fill, Order, OrderType, Side
+
+# Gates loose enough that the dummy walks trade
+LOOSE = DEFAULT_CONFIG.with_overrides({
+    "strategy_rules": {"required_rvol": 0.0, "required_atr_pct": 0.0, "reversal_rsi_max": 101},
+    "risk_rules": {"risk_fraction": 0.001},
+})
+
+
+def _run(path, append=False):
+    data = {s: make_dummy_bars(s, 300, seed=2) for s in ("AAA", "BBB", "CCC")}
+    with JournalWriter(path, append=append) as journal:
+        bt = StrategyBacktester(100_000, respect_schedule=False, journal=journal, config=LOOSE)
+        result = bt.run(data)
+    return result
+
+
+def test_replay_matches_the_live_run(tmp_path):
+    path = str(tmp_path / "run.vtj")
+    live = _run(path)
+    assert live.trades
+    for fill_rules in (None, dict(LOOSE.fill_rules)):
+        replayed = replay(path, fill_rules=fill_rules)
+        assert replayed.unfilled == 0
+        assert [(t.symbol, t.entry_time, t.exit_time, t.duration_bars) for t in replayed.trades] == [
+            (t.symbol, t.entry_time, t.exit_time, t.duration_bars) for t in live.trades
+        ]
+        assert [t.pnl for t in replayed.trades] == pytest.approx([t.pnl for t in live.trades])
+        assert [d.time for d in replayed.dailies] == [d.time for d in live.dailies]
+        assert [d.pnl for d in replayed.dailies] == pytest.approx([d.pnl for d in live.dailies])
+
+
+@pytest.mark.parametrize("append", [False, True])
+def test_reused_path_replays_only_the_last_run(tmp_path, append):
+    path = str(tmp_path / "run.vtj")
+    _run(path)
+    single = replay(path)
+    live = _run(path, append=append)
+    replayed = replay(path)
+    assert len(replayed.trades) == len(live.trades) == len(single.trades)
+    assert len(replayed.dailies) == len(live.dailies)
+    assert replayed.metrics == single.metrics
+
+
+def test_fill_rules_resize_limit_fills(tmp_path):
+    path = str(tmp_path / "run.vtj")
+    market = {"bid": 10.0, "ask": 10.0, "last": 10.0, "volume": 1000.0}
+    entry = Order(symbol="XYZ", side=Side.BUY, quantity=100, order_type=OrderType.LIMIT, price=10.0)
+    exit_ = Order(symbol="XYZ", side=Side.SELL, quantity=100, order_type=OrderType.MARKET)
+    with JournalWriter(path) as journal:
+        journal.order(60, entry, market)
+        journal.fill(Fill(entry, 50, 10.0, 60))
+        journal.order(120, exit_, {**market, "bid": 12.0})
+        journal.fill(Fill(exit_, 50, 12.0, 120))
+        journal.close_position(120, "XYZ", 1, 0)
+        journal.day(120, 100.0)
+
+    recorded = replay(path)
+    assert [t.pnl for t in recorded.trades] == [100.0]
+    thinner = replay(path, fill_rules={"volume_participation": 0.01, "slippage_bps": 0})
+    assert [t.pnl for t in thinner.trades] == pytest.approx([20.0])
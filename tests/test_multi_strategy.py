@@ -0,0 +1,44 @@
+import pytest
+
+from volatility_trader.__main__ import make_dummy_bars
+from volatility_trader.backtest import StrategyBacktester
+from volatility_trader.config import DEFAULT_CONFIG
+from volatility_trader.multi_strategy import MultiStrategyBacktester, StrategyVariant
+
+LOOSE = DEFAULT_CONFIG.with_overrides({
+    "strategy_rules": {"required_rvol": 0.0, "required_atr_pct": 0.0, "reversal_rsi_max": 101},
+    "risk_rules": {"risk_fraction": 0.001},
+})
+VARIANTS = {
+    "base": {},
+    "wide-stops": {"breakout_stop_atr": 3.0, "reversal_stop_atr": 2.5},
+    "quick-targets": {"breakout_reward_risk": 1.0, "reversal_reward_risk": 1.0},
+    "rvol-gate": {"required_rvol": 1.0},
+    "rsi-cutoff": {"reversal_rsi_max": 45},
+}
+
+
+def _trades(result):
+    return [(t.symbol, t.entry_time, t.exit_time, t.pnl, t.duration_bars) for t in result.trades]
+
+
+def test_each_variant_matches_an_independent_run():
+    data = {s: make_dummy_bars(s, 320, seed=2) for s in ("AAA", "BBB", "CCC")}
+    multi = MultiStrategyBacktester(
+        [StrategyVariant(name, rules, respect_schedule=False) for name, rules in VARIANTS.items()],
+        config=LOOSE,
+    )
+    results = multi.run(data)
+    summaries = multi.summarize()
+    assert len({tuple(_trades(r)) for r in results.values()}) > 1
+    for name, rules in VARIANTS.items():
+        alone = StrategyBacktester(100_000, respect_schedule=False, strategy_rules=rules, config=LOOSE)
+        result = alone.run(data)
+        assert _trades(results[name]) == _trades(result), name
+        assert [(d.time, d.pnl) for d in results[name].dailies] == [(d.time, d.pnl) for d in result.dailies]
+        assert summaries[name] == alone.summarize()
+
+
+def test_variant_names_must_be_unique():
+    with pytest.raises(ValueError):
+        MultiStrategyBacktester([StrategyVariant("a"), StrategyVariant("a")])
@@ -0,0 +1,76 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from volatility_trader import polygon_data
+from volatility_trader.data import BarColumns
+from volatility_trader.normalize import normalize_bars, normalize_columns
+from volatility_trader.types import Bar
+
+ET = ZoneInfo("America/New_York")
+
+
+def _at(day, hour, minute):
+    return int(datetime(2023, 3, day, hour, minute, tzinfo=ET).timestamp())
+
+
+def _bar(t, close=10.0, volume=100.0, high=None, low=None):
+    return Bar("XYZ", t, 10.0, close + 1 if high is None else high, 9.0 if low is None else low, close, volume)
+
+
+def test_sorts_and_keeps_the_last_row_of_each_duplicate():
+    t0 = _at(13, 9, 30)
+    rows = [_bar(t0 + 60), _bar(t0), _bar(t0 + 120), _bar(t0 + 60, close=10.5), _bar(t0 + 180)]
+    bars, report = normalize_bars(rows)
+    assert [b.time for b in bars] == [t0, t0 + 60, t0 + 120, t0 + 180]
+    assert bars[1].close == 10.5
+    assert (report.input_rows, report.output_rows) == (5, 4)
+    assert report.out_of_order == 2
+    assert report.duplicates == 1
+    assert not report.clean
+
+
+def test_missing_polygon_fields_are_flagged_not_zeroed(monkeypatch):
+    t0 = _at(13, 9, 30)
+    rows = [
+        {"t": t0 * 1000, "o": 10, "h": 11, "l": 9, "c": 10, "v": 100},
+        {"t": (t0 + 60) * 1000, "o": 10, "h": 11, "l": 9, "v": 100},
+        {"t": (t0 + 120) * 1000, "o": 10, "h": 11, "l": 9, "c": 10},
+        {"t": (t0 + 180) * 1000, "o": 10, "h": 11, "l": 9, "c": 10, "v": 100},
+    ]
+    monkeypatch.setattr(polygon_data, "_load_json", lambda url: {"results": rows})
+    fetched = polygon_data.fetch_polygon_bars(["XYZ"], "2023-03-13", "2023-03-13", api_key="key")["XYZ"]
+    assert fetched[1].close != fetched[1].close
+    bars, report = normalize_bars(fetched)
+    assert [b.time for b in bars] == [t0, t0 + 180]
+    assert report.missing_fields == 2
+    assert report.dropped == 2
+
+
+def test_zero_volume_and_inconsistent_bars():
+    t0 = _at(13, 9, 30)
+    rows = [_bar(t0), _bar(t0 + 60, volume=0.0), _bar(t0 + 120, high=8.0), _bar(t0 + 180, low=0.0)]
+    bars, report = normalize_bars(rows)
+    assert [b.time for b in bars] == [t0]
+    assert (report.zero_volume, report.invalid_ohlc) == (1, 2)
+    kept, report = normalize_bars(rows, drop_zero_volume=False)
+    assert [b.time for b in kept] == [t0, t0 + 60]
+    assert report.zero_volume == 1
+
+
+def test_session_and_gap_flags():
+    first = [_bar(_at(10, 15, 55) + 60 * i) for i in range(5)]
+    # Across the DST change, with a four-minute hole after 09:32
+    second = [_bar(_at(13, 9, 30) + 60 * i) for i in (0, 1, 2, 6, 7)]
+    result = normalize_columns(BarColumns.from_bars("XYZ", first + second))
+    assert list(result.session_start) == [1, 0, 0, 0, 0, 1, 0, 0, 0, 0]
+    assert list(result.gap_before) == [0, 0, 0, 0, 0, 0, 0, 0, 1, 0]
+    report = result.report
+    assert (report.sessions, report.gaps, report.expected_interval) == (2, 1, 60)
+    assert report.dropped == 0 and not report.clean
+
+
+def test_clean_bars_pass_through():
+    bars = [_bar(_at(13, 9, 30) + 60 * i, close=10 + i / 10) for i in range(30)]
+    out, report = normalize_bars(bars)
+    assert out == bars
+    assert report.clean and report.sessions == 1
@@ -0,0 +1,100 @@
+import json
+import threading
+from datetime import date, datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from volatility_trader.__main__ import JOB_DEFAULTS, dataset_name, load_symbols
+from volatility_trader.data import BarStore
+from volatility_trader.polygon_data import fetch_grouped_daily
+
+GROUPED = "/v2/aggs/grouped/locale/us/market/stocks/"
+HOLIDAY = date(2023, 1, 16)
+TICKERS = ("AAA", "BBB", "CCC")
+
+
+def _row(symbol, day):
+    t = int(datetime(day.year, day.month, day.day, 21, tzinfo=timezone.utc).timestamp() * 1000)
+    base = 10.0 * (TICKERS.index(symbol) + 1) + day.day
+    return {"T": symbol, "o": base, "h": base + 1, "l": base - 1, "c": base + 0.5, "v": 1000.0 * day.day, "t": t}
+
+
+@pytest.fixture
+def standin():
+    # Local stand-in for the grouped-daily endpoint; records every path it is asked for
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            assert parse_qs(url.query)["apiKey"] == ["key"]
+            requests.append(url.path)
+            if not url.path.startswith(GROUPED):
+                self.send_response(404)
+                self.end_headers()
+                return
+            day = date.fromisoformat(url.path[len(GROUPED):])
+            body = {"resultsCount": 0} if day == HOLIDAY else {"results": [_row(s, day) for s in TICKERS]}
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_one_request_per_weekday_pivoted_by_symbol(standin):
+    base_url, requests = standin
+    # Friday through the next Wednesday, with the Monday a holiday
+    columns = fetch_grouped_daily("2023-01-13", "2023-01-18", api_key="key", base_url=base_url)
+    assert requests == [GROUPED + d for d in ("2023-01-13", "2023-01-16", "2023-01-17", "2023-01-18")]
+    assert sorted(columns) == list(TICKERS)
+    days = [date(2023, 1, 13), date(2023, 1, 17), date(2023, 1, 18)]
+    for symbol, cols in columns.items():
+        assert cols.symbol == symbol
+        assert list(cols.time) == [_row(symbol, d)["t"] // 1000 for d in days]
+        assert list(cols.close) == [_row(symbol, d)["c"] for d in days]
+        assert list(cols.volume) == [_row(symbol, d)["v"] for d in days]
+
+    kept = fetch_grouped_daily("2023-01-13", "2023-01-13", api_key="key", symbols=["BBB"], base_url=base_url)
+    assert list(kept) == ["BBB"]
+
+
+def test_grouped_run_fills_the_bar_store_and_later_runs_read_it(standin, tmp_path, monkeypatch):
+    base_url, requests = standin
+    monkeypatch.setenv("POLYGON_API_KEY", "key")
+    monkeypatch.setenv("POLYGON_BASE_URL", base_url)
+    job = {
+        **JOB_DEFAULTS,
+        "polygon": True,
+        "grouped_daily": True,
+        "timespan": "day",
+        "start": "2023-01-13",
+        "end": "2023-01-18",
+        "cache_dir": str(tmp_path),
+        "symbols": ["AAA"],
+    }
+    first = load_symbols(job, {})
+    assert len(requests) == 4
+    assert len(first["AAA"]) == 3
+    # Every ticker in the responses is stored, not just the one asked for
+    store = BarStore(str(tmp_path))
+    for symbol in TICKERS:
+        assert store.load(dataset_name(job, symbol)) is not None
+
+    second = load_symbols({**job, "symbols": ["CCC", "AAA"]}, {})
+    assert len(requests) == 4
+    assert second["AAA"] == first["AAA"]
+    days = [date(2023, 1, 13), date(2023, 1, 17), date(2023, 1, 18)]
+    assert [b.close for b in second["CCC"]] == [_row("CCC", d)["c"] for d in days]
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from volatility_trader.backtest import StrategyBacktester, iter_market_steps
+from volatility_trader.resample import StreamingResampler, resample_bars, timeframe_seconds
+from volatility_trader.scanner import IndicatorParams, SignalContextCache, build_mixed_context
+from volatility_trader.synthetic import SyntheticSpec, generate_market
+
+ET = ZoneInfo("America/New_York")
+SMALL = IndicatorParams(ema_fast=3, ema_slow=5, rsi_period=3, atr_period=3, bb_period=3, rvol_lookback=3)
+
+
+def _minute_bars(start, days, symbol="XYZ"):
+    return generate_market([symbol], SyntheticSpec(start=start, days=days), seed=4)[symbol].to_bars()
+
+
+def _fields(bars):
+    return [(b.time, b.open, b.high, b.low, b.close, b.volume) for b in bars]
+
+
+@pytest.mark.parametrize("timeframe", ["5m", "15m", "60m", "1d"])
+def test_streaming_matches_batch_across_dst(timeframe):
+    # 2023-03-12 moves ET from UTC-5 to UTC-4 between these sessions
+    bars = _minute_bars("2023-03-09", 4)
+    streaming = StreamingResampler("XYZ", timeframe)
+    completed = [done for done in map(streaming.update, bars) if done is not None]
+    completed.append(streaming.flush())
+    assert _fields(completed) == _fields(resample_bars(bars, timeframe))
+
+
+def test_buckets_are_anchored_to_the_et_open_and_day():
+    bars = _minute_bars("2023-03-09", 4)
+    quarter_hours = [datetime.fromtimestamp(b.time, tz=ET) for b in resample_bars(bars, "15m")]
+    assert {(t.hour, t.minute) for t in quarter_hours if t.hour == 9} == {(9, 30), (9, 45)}
+    assert {t.minute for t in quarter_hours} == {0, 15, 30, 45}
+    days = [datetime.fromtimestamp(b.time, tz=ET) for b in resample_bars(bars, "1d")]
+    assert [(t.day, t.hour, t.minute) for t in days] == [(9, 0, 0), (10, 0, 0), (13, 0, 0), (14, 0, 0)]
+    assert sum(b.volume for b in resample_bars(bars, "1d")) == sum(b.volume for b in bars)
+
+
+def test_unknown_timeframe():
+    with pytest.raises(ValueError, match="Unknown timeframe"):
+        timeframe_seconds("7x")
+
+
+def test_daily_contexts_are_priced_at_the_current_minute():
+    bars = _minute_bars("2023-03-01", 12)
+    steps = iter_market_steps({"XYZ": bars}, SignalContextCache(), SMALL, context_timeframe="1d")
+    checked = 0
+    for i, step in enumerate(steps):
+        ctx = step.contexts.get("XYZ")
+        if ctx is None or i % 97:
+            continue
+        today = datetime.fromtimestamp(step.time, tz=ET).date()
+        completed = [b for b in resample_bars(bars[:i + 1], "1d")
+                     if datetime.fromtimestamp(b.time, tz=ET).date() < today]
+        expected = build_mixed_context(bars[:i + 1], completed, SMALL)
+        assert ctx.price == bars[i].close
+        assert ctx == expected
+        checked += 1
+    assert checked > 10
+
+
+def test_backtester_runs_on_daily_contexts():
+    bars = {s: _minute_bars("2023-03-01", 12, s) for s in ("AAA", "BBB")}
+    bt = StrategyBacktester(100_000, respect_schedule=True, indicator_params=SMALL, context_timeframe="1d")
+    result = bt.run(bars)
+    assert len(result.dailies) == 12
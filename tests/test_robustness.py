@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from volatility_trader import robustness
+from volatility_trader.metrics import Daily, Trade, max_drawdown, profit_factor, sharpe_ratio
+
+
+def _history(days=250, trades=300, seed=0):
+    rng = random.Random(seed)
+    return (
+        [Trade(rng.gauss(50, 300), True, exit_time=i) for i in range(trades)],
+        [Daily(rng.gauss(40, 400), time=i) for i in range(days)],
+    )
+
+
+@pytest.fixture(params=["numpy", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(robustness, "np", None)
+    return request.param
+
+
+def _reference(trades, dailies, samples, seed):
+    # Plain resampling loop over the metrics functions
+    rng = random.Random(seed)
+    pnls = [t.pnl for t in trades]
+    values = [d.pnl for d in dailies]
+    sharpes, drawdowns, factors = [], [], []
+    for _ in range(samples):
+        path = rng.choices(values, k=len(values))
+        sharpes.append(sharpe_ratio(path))
+        drawdowns.append(max_drawdown(path))
+        factors.append(profit_factor(rng.choices(pnls, k=len(pnls))))
+    return [_quantiles(v) for v in (sharpes, drawdowns, factors)]
+
+
+def _quantiles(values):
+    ordered = sorted(values)
+    return [ordered[int(q * (len(ordered) - 1))] for q in (0.025, 0.25, 0.5, 0.75)]
+
+
+def test_bootstrap_agrees_with_a_plain_resampling_loop(backend):
+    trades, dailies = _history()
+    report = robustness.bootstrap(trades, dailies, samples=4000, seed=1)
+    reference = _reference(trades, dailies, 4000, seed=2)
+    # Drawdown ratios are heavy-tailed, so the upper bound is too noisy to compare
+    for got, want in zip((report.sharpe_ratio, report.max_drawdown, report.profit_factor), reference):
+        spread = want[3] - want[1]
+        assert abs(got.low - want[0]) < 0.2 * spread
+        assert abs(got.median - want[2]) < 0.2 * spread
+
+
+def test_seed_fixes_the_report(backend):
+    trades, dailies = _history()
+    for method in (robustness.bootstrap, robustness.block_bootstrap, robustness.permutation):
+        first = method(trades, dailies, samples=500, seed=4)
+        assert method(trades, dailies, samples=500, seed=4) == first
+        assert method(trades, dailies, samples=500, seed=5) != first
+
+
+def test_permutation_only_moves_drawdown(backend):
+    trades, dailies = _history(days=60, trades=40)
+    report = robustness.permutation(trades, dailies, samples=300, seed=0)
+    values = [d.pnl for d in dailies]
+    assert report.sharpe_ratio.low == report.sharpe_ratio.high == sharpe_ratio(values)
+    assert report.profit_factor.median == profit_factor([t.pnl for t in trades])
+    assert report.max_drawdown.low < report.max_drawdown.high
+    # A series that never loses has no drawdown in any order
+    gains = [Daily(abs(d.pnl) + 1) for d in dailies]
+    assert robustness.permutation(trades, gains, samples=50, seed=0).max_drawdown.high == 0.0
+
+
+def test_one_block_per_resample_rotates_the_series(backend):
+    trades, dailies = _history(days=60, trades=40)
+    report = robustness.block_bootstrap(trades, dailies, block_size=60, samples=300, seed=0)
+    # Every resample is a rotation: same values, so the same Sharpe; only the order moves
+    values = [d.pnl for d in dailies]
+    assert report.sharpe_ratio.low == pytest.approx(sharpe_ratio(values), rel=1e-9)
+    assert report.sharpe_ratio.high == pytest.approx(sharpe_ratio(values), rel=1e-9)
+    rotations = [max_drawdown(values[i:] + values[:i]) for i in range(60)]
+    assert min(rotations) <= report.max_drawdown.low <= report.max_drawdown.high <= max(rotations)
+
+
+def test_backends_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    trades, dailies = _history()
+    for method in (robustness.bootstrap, robustness.block_bootstrap, robustness.permutation):
+        vectorized = method(trades, dailies, samples=4000, seed=1)
+        monkeypatch.setattr(robustness, "np", None)
+        looped = method(trades, dailies, samples=4000, seed=1)
+        monkeypatch.undo()
+        for field in ("sharpe_ratio", "max_drawdown", "profit_factor"):
+            a, b = getattr(vectorized, field), getattr(looped, field)
+            assert a.median == pytest.approx(b.median, rel=0.05)
+
+
+def test_walk_forward_scores_each_window_with_the_metrics():
+    trades, dailies = _history(days=100, trades=100)
+    windows = robustness.walk_forward(trades, dailies, train_days=40, test_days=20)
+    assert [(w.train, w.test) for w in windows] == [
+        (range(0, 40), range(40, 60)),
+        (range(20, 60), range(60, 80)),
+        (range(40, 80), range(80, 100)),
+    ]
+    values = [d.pnl for d in dailies]
+    for w in windows:
+        test = values[w.test.start:w.test.stop]
+        assert w.train_sharpe == sharpe_ratio(values[w.train.start:w.train.stop])
+        assert (w.test_sharpe, w.test_max_drawdown) == (sharpe_ratio(test), max_drawdown(test))
+        # Trades exiting after the day before the window and up to its last day
+        pnls = [t.pnl for t in trades if w.test.start - 1 < t.exit_time <= w.test.stop - 1]
+        assert (w.test_trades, w.test_profit_factor) == (len(pnls), profit_factor(pnls))
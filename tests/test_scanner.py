@@ -0,0 +1,104 @@
+import threading
+
+from volatility_trader.__main__ import make_dummy_bars
+from volatility_trader.backtest import StrategyBacktester
+from volatility_trader.config import DEFAULT_CONFIG
+from volatility_trader.scanner import LazySignalContext, SignalContextCache, build_signal_context
+from volatility_trader.signals import evaluate_breakout, evaluate_reversal
+
+
+def test_cache_keeps_datasets_on_the_same_time_grid_apart():
+    cache = SignalContextCache()
+    first = make_dummy_bars("XYZ", 220, seed=0)
+    second = make_dummy_bars("XYZ", 220, seed=1)
+    assert [b.time for b in first] == [b.time for b in second]
+
+    lazy_first = cache.get_lazy("XYZ", first, 220)
+    lazy_second = cache.get_lazy("XYZ", second, 220)
+    assert lazy_first is not lazy_second
+    assert lazy_second.price == second[-1].close
+
+    assert cache.get("XYZ", first).price == first[-1].close
+    assert cache.get("XYZ", second) == build_signal_context(second)
+    assert cache.get_lazy("XYZ", first, 220) is lazy_first
+    assert cache.get("XYZ", list(first)).price == first[-1].close
+    assert cache.stats()["hits"] == 2
+
+
+def test_backtests_over_different_datasets_match_isolated_runs():
+    # Loose gates and small positions so the dummy data trades at all
+    config = DEFAULT_CONFIG.with_overrides({
+        "strategy_rules": {"required_rvol": 0.0, "required_atr_pct": 0.0, "reversal_rsi_max": 101},
+        "risk_rules": {"risk_fraction": 0.001},
+    })
+    cache = SignalContextCache()
+
+    def run(seed, context_cache=cache):
+        data = {s: make_dummy_bars(s, 300, seed=seed) for s in ("AAA", "BBB", "CCC")}
+        bt = StrategyBacktester(100_000, respect_schedule=False, context_cache=context_cache, config=config)
+        return [(t.symbol, t.entry_time, t.exit_time, t.pnl) for t in bt.run(data).trades]
+
+    alone = run(2, SignalContextCache())
+    assert alone
+    run(1)
+    assert run(2) == alone
+
+
+def test_cache_survives_concurrent_eviction():
+    cache = SignalContextCache(maxsize=8)
+    bars = make_dummy_bars("XYZ", 260)
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(200):
+                for end in range(200, 260):
+                    cache.get_lazy("XYZ", bars, end)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len(cache) <= 8
+
+
+def test_lazy_context_materializes_to_the_full_context():
+    bars = make_dummy_bars("XYZ", 320, seed=5)
+    for end in (200, 201, 250, 320):
+        assert LazySignalContext(bars, end).materialize() == build_signal_context(bars[:end])
+
+
+def test_gates_reject_before_the_expensive_indicators_are_computed():
+    bars = make_dummy_bars("XYZ", 320, seed=5)
+
+    def evaluate(rules):
+        cache = SignalContextCache()
+        for end in range(200, 320):
+            ctx = cache.get_lazy("XYZ", bars, end)
+            if not evaluate_breakout(ctx, False, False, rules=rules).should_enter:
+                evaluate_reversal(ctx, rules=rules)
+        return dict(cache.evaluations)
+
+    rules = dict(DEFAULT_CONFIG.strategy_rules)
+    assert evaluate({**rules, "required_rvol": 1e9}) == {"rvol": 120}
+    assert evaluate({**rules, "required_rvol": 0.0, "required_atr_pct": 1e9}) == {"rvol": 120, "atr": 120}
+
+
+def test_evaluation_counts_are_exact_under_threads():
+    cache = SignalContextCache()
+    bars = make_dummy_bars("XYZ", 400)
+
+    def worker(offset):
+        for end in range(200 + offset, 400, 4):
+            cache.get_lazy("XYZ", bars, end).rvol
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.stats()["evaluations"] == {"rvol": 200}
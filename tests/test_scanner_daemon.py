@@ -0,0 +1,80 @@
+import os
+import socket
+import tempfile
+import threading
+from dataclasses import asdict
+
+import pytest
+
+from volatility_trader.__main__ import make_dummy_bars
+from volatility_trader.scanner_daemon import ScannerClient, ScannerDaemon
+
+
+@pytest.fixture
+def socket_dir():
+    # Unix socket paths are limited to about 100 bytes, so stay out of deep pytest dirs
+    with tempfile.TemporaryDirectory(dir="/tmp") as path:
+        yield path
+
+
+def test_refuses_to_replace_a_regular_file(socket_dir):
+    path = os.path.join(socket_dir, "results.csv")
+    with open(path, "w") as fh:
+        fh.write("keep me")
+    with pytest.raises(FileExistsError):
+        ScannerDaemon(path)
+    with open(path) as fh:
+        assert fh.read() == "keep me"
+
+
+def test_replaces_a_stale_socket_and_removes_it_on_close(socket_dir):
+    path = os.path.join(socket_dir, "scan.sock")
+    # Left behind by a process that died without cleaning up
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+
+    daemon = ScannerDaemon(path)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    with ScannerClient(path) as client:
+        bars = [asdict(b) for b in make_dummy_bars("XYZ", 220)]
+        assert client.request({"op": "ingest", "bars": bars})["ingested"] == 220
+        assert client.request({"op": "stats"})["symbols"] == 1
+    daemon.shutdown()
+    daemon.server_close()
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize("replacement", ["file", "socket"])
+def test_close_leaves_whatever_replaced_its_socket(socket_dir, replacement):
+    path = os.path.join(socket_dir, "scan.sock")
+    daemon = ScannerDaemon(path)
+    os.unlink(path)
+    other = None
+    if replacement == "file":
+        with open(path, "w") as fh:
+            fh.write("not a socket")
+    else:
+        other = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        other.bind(path)
+    daemon.server_close()
+    assert os.path.exists(path)
+    if other is not None:
+        other.close()
+
+
+def test_refuses_to_take_over_a_live_daemons_socket(socket_dir):
+    path = os.path.join(socket_dir, "scan.sock")
+    first = ScannerDaemon(path)
+    thread = threading.Thread(target=first.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with pytest.raises(FileExistsError, match="Another daemon"):
+            ScannerDaemon(path)
+        with ScannerClient(path) as client:
+            assert client.request({"op": "stats"})["ok"]
+    finally:
+        first.shutdown()
+        first.server_close()
+    assert not os.path.exists(path)
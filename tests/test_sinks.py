@@ -0,0 +1,43 @@
+import os
+
+from volatility_trader.__main__ import make_dummy_bars
+from volatility_trader.backtest import StrategyBacktester
+from volatility_trader.config import DEFAULT_CONFIG
+from volatility_trader.metrics import Trade
+from volatility_trader.sinks import ColumnarSink, CsvSink, read_columnar_table
+
+
+def _trades(count):
+    return [Trade(pnl=float(i), adhered_to_plan=True, symbol="XYZ") for i in range(count)]
+
+
+def test_reused_directory_only_holds_the_latest_run(tmp_path):
+    with ColumnarSink(str(tmp_path), chunk_rows=2) as sink:
+        for trade in _trades(5):
+            sink.write_trade(trade)
+    with CsvSink(str(tmp_path), chunk_rows=2) as sink:
+        for trade in _trades(3):
+            sink.write_trade(trade)
+    (tmp_path / "notes.txt").write_text("kept")
+    assert sorted(os.listdir(tmp_path)) == ["notes.txt", "trades-00000.csv", "trades-00001.csv"]
+
+    with ColumnarSink(str(tmp_path), chunk_rows=2) as sink:
+        sink.write_trade(_trades(1)[0])
+    assert [len(chunk["pnl"]) for chunk in read_columnar_table(str(tmp_path), "trades")] == [1]
+    assert sorted(os.listdir(tmp_path)) == ["notes.txt", "trades-00000.col"]
+
+
+def test_summary_without_retained_trades_matches_full_run(tmp_path):
+    config = DEFAULT_CONFIG.with_overrides({
+        "strategy_rules": {"required_rvol": 0.0, "required_atr_pct": 0.0, "reversal_rsi_max": 101},
+        "risk_rules": {"risk_fraction": 0.001},
+    })
+    data = {s: make_dummy_bars(s, 300, seed=2) for s in ("AAA", "BBB", "CCC")}
+    kept = StrategyBacktester(100_000, respect_schedule=False, config=config)
+    kept.run(data)
+    with CsvSink(str(tmp_path)) as sink:
+        streamed = StrategyBacktester(100_000, respect_schedule=False, sink=sink, retain_results=False, config=config)
+        streamed.run(data)
+    assert kept.trades and not streamed.trades
+    assert streamed.trade_totals.count == len(kept.trades)
+    assert streamed.summarize() == kept.summarize()
@@ -0,0 +1,53 @@
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from volatility_trader import synthetic
+from volatility_trader.synthetic import SyntheticSpec, generate_market, generate_symbol
+
+ET = ZoneInfo("America/New_York")
+# Spans the 2023-03-12 switch from EST to EDT
+SPEC = SyntheticSpec(start="2023-03-08", days=6)
+
+
+@pytest.fixture(params=["numpy", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(synthetic, "np", None)
+    return request.param
+
+
+def _rows(cols):
+    return list(zip(cols.time, cols.open, cols.high, cols.low, cols.close, cols.volume))
+
+
+def test_seed_fixes_each_symbols_bars(backend):
+    market = generate_market(["AAA", "BBB"], SPEC, seed=3)
+    assert _rows(market["AAA"]) == _rows(generate_market(["AAA", "BBB"], SPEC, seed=3)["AAA"])
+    # A symbol's stream does not depend on which other symbols are generated with it
+    assert _rows(market["BBB"]) == _rows(generate_symbol("BBB", SPEC, seed=3))
+    assert _rows(market["AAA"]) != _rows(generate_market(["AAA"], SPEC, seed=4)["AAA"])
+    assert _rows(market["AAA"]) != _rows(market["BBB"])
+
+
+def test_bars_are_aligned_to_et_sessions(backend):
+    cols = generate_symbol("AAA", SPEC, seed=1)
+    stamps = [datetime.fromtimestamp(t, tz=ET) for t in cols.time]
+    days = sorted({s.date() for s in stamps})
+    assert len(days) == SPEC.days and all(d.weekday() < 5 for d in days)
+    assert len(cols) == SPEC.days * 390
+    assert all(time(9, 30) <= s.time() < time(16, 0) for s in stamps)
+    assert [s.time() for s in stamps[::390]] == [time(9, 30)] * SPEC.days
+    assert list(cols.time) == sorted(cols.time)
+
+
+def test_bars_are_consistent(backend):
+    cols = generate_symbol("AAA", SPEC, seed=1)
+    for _, o, h, l, c, v in _rows(cols):
+        assert 0 < l <= min(o, c) and max(o, c) <= h
+        assert v > 0
+    # Within a session each bar opens at the previous close
+    assert all(cols.open[i] == cols.close[i - 1] for i in range(1, len(cols)) if i % 390)
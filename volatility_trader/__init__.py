@@ -1 +1 @@
-__all__ = ['config', 'types', 'indicators', 'signals', 'risk', 'execution', 'account', 'scanner', 'metrics', 'data', 'backtest']
+__all__ = ['config', 'types', 'indicators', 'signals', 'risk', 'execution', 'account', 'scanner', 'metrics', 'data', 'backtest', 'resample', 'robustness', 'sinks', 'normalize', 'synthetic', 'multi_strategy', 'journal', 'indicator_store', 'scanner_daemon']
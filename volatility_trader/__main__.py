@@ -1,30 +1,75 @@
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import random
+import sys
 import time
+from dataclasses import asdict
+from typing import Dict, Iterator, List, Tuple
 
 from .types import Bar
 from .backtest import StrategyBacktester
-from .polygon_data import fetch_polygon_bars
+from .data import BarColumns, BarStore
+from .indicator_store import IndicatorArrays, IndicatorStore
+from .config import DEFAULT_CONFIG
+from .scanner import SignalContextCache
+from .normalize import normalize_bars
+from .resample import resample_bars
+from .sinks import open_sink
+from .journal import JournalWriter, replay
+from .synthetic import SyntheticSpec, generate_market
 
+# Fixed epoch (2023-01-02 00:00 UTC) so offline runs are reproducible
+DUMMY_START = 1_672_617_600
 
-def make_dummy_bars(symbol: str, days: int = 220) -> list[Bar]:
+# Per-symbol bars keyed by (data source and range, symbol, resample timeframe)
+BarCache = Dict[Tuple, List[Bar]]
+
+JOB_DEFAULTS = {
+    "name": None,
+    "symbols": ["XYZ", "ABC", "DEF"],
+    "polygon": False,
+    "start": "2023-01-01",
+    "end": "2023-06-30",
+    "timespan": "minute",
+    "multiplier": 1,
+    "resample": None,
+    "context_timeframe": None,
+    "equity": 100_000,
+    "respect_schedule": None,
+    "output": None,
+    "output_format": "csv",
+    "retain_results": True,
+    "normalize": True,
+    "stream_days": False,
+    "journal": None,
+    "synthetic": "daily",
+    "days": 220,
+    "seed": 0,
+    "cache_dir": None,
+    "grouped_daily": False,
+    "overrides": {},
+}
+
+
+def make_dummy_bars(symbol: str, days: int = 220, seed: int = 0, start: int = DUMMY_START) -> list[Bar]:
+    rng = random.Random(f"{seed}:{symbol}")
     bars: list[Bar] = []
     price = 100.0
     for i in range(days):
-        change = random.uniform(-1.0, 1.0)
+        change = rng.uniform(-1.0, 1.0)
         open_ = price
         high = open_ + abs(change) * 1.5
         low = open_ - abs(change) * 1.5
         close = open_ + change
-        volume = 1_000_000 + random.randint(-50_000, 50_000)
+        volume = 1_000_000 + rng.randint(-50_000, 50_000)
         price = close
         bars.append(
             Bar(
                 symbol=symbol,
-                time=int(time.time()) + i * 86400,
+                time=start + i * 86400,
                 open=open_,
                 high=high,
                 low=low,
@@ -35,14 +80,296 @@ def make_dummy_bars(symbol: str, days: int = 220) -> list[Bar]:
     return bars
 
 
+def make_synthetic_bars(symbols: List[str], job: dict) -> Dict[str, List[Bar]]:
+    if job["synthetic"] == "daily":
+        return {symbol: make_dummy_bars(symbol, job["days"], job["seed"]) for symbol in symbols}
+    spec = SyntheticSpec(start=job["start"], days=job["days"])
+    return {symbol: cols.to_bars() for symbol, cols in generate_market(symbols, spec, job["seed"]).items()}
+
+
+def polygon_api() -> Tuple[str, str]:
+    api_key = os.environ.get("POLYGON_API_KEY", "")
+    if not api_key:
+        raise SystemExit("POLYGON_API_KEY is not set. Add it to your environment before running.")
+    # POLYGON_BASE_URL points runs at a local mirror or stand-in server
+    from .polygon_data import DEFAULT_BASE_URL
+
+    return api_key, os.environ.get("POLYGON_BASE_URL", DEFAULT_BASE_URL)
+
+
+def job_source(job: dict) -> Tuple:
+    if job["polygon"]:
+        return ("polygon", job["start"], job["end"], job["timespan"], job["multiplier"])
+    return ("synthetic", job["synthetic"], job["start"], job["days"], job["seed"])
+
+
+def dataset_name(job: dict, symbol: str) -> str:
+    # File-system friendly name for one symbol's bars over the job's range
+    parts = [*job_source(job), symbol, job["resample"] or "base"]
+    return "-".join(str(p) for p in parts).replace("/", "_")
+
+
+def series_name(job: dict, symbol: str) -> str:
+    # Like dataset_name without the range, so a longer range of the same series finds the
+    # shorter range's indicator file and only computes the new tail
+    if job["polygon"]:
+        source = ("polygon", job["timespan"], job["multiplier"])
+    else:
+        source = ("synthetic", job["synthetic"], job["seed"])
+    parts = [*source, symbol, job["resample"] or "base"]
+    return "-".join(str(p) for p in parts).replace("/", "_")
+
+
+def load_symbols(job: dict, cache: BarCache) -> Dict[str, List[Bar]]:
+    source = job_source(job)
+
+    def key_for(symbol: str, resample: str | None = None) -> Tuple:
+        return (source, symbol, resample)
+
+    missing = [symbol for symbol in job["symbols"] if key_for(symbol) not in cache]
+    if missing and job["polygon"] and job["cache_dir"]:
+        # Bars persisted by an earlier run of the same range are read back instead of refetched
+        store = BarStore(job["cache_dir"])
+        for symbol in missing:
+            stored = store.load(dataset_name({**job, "resample": None}, symbol))
+            if stored is not None:
+                cache[key_for(symbol)] = stored.to_bars()
+        missing = [symbol for symbol in missing if key_for(symbol) not in cache]
+    if missing:
+        store = BarStore(job["cache_dir"]) if job["polygon"] and job["cache_dir"] else None
+        if job["polygon"] and job["grouped_daily"]:
+            # Imported lazily so offline and cached runs never load the HTTP client
+            from .polygon_data import fetch_grouped_daily
+
+            api_key, base_url = polygon_api()
+            # With a cache directory every ticker of each day is kept, refreshing the universe
+            grouped = fetch_grouped_daily(
+                job["start"],
+                job["end"],
+                api_key=api_key,
+                symbols=None if store is not None else missing,
+                base_url=base_url,
+            )
+            fetched = {symbol: cols.to_bars() for symbol, cols in grouped.items()}
+            for symbol in missing:
+                fetched.setdefault(symbol, [])
+        elif job["polygon"]:
+            from .polygon_data import fetch_polygon_bars
+
+            api_key, base_url = polygon_api()
+            fetched = fetch_polygon_bars(
+                missing,
+                start=job["start"],
+                end=job["end"],
+                api_key=api_key,
+                multiplier=job["multiplier"],
+                timespan=job["timespan"],
+                base_url=base_url,
+            )
+        else:
+            fetched = make_synthetic_bars(missing, job)
+        wanted = set(missing)
+        for symbol, bars in fetched.items():
+            if job["polygon"] and job["normalize"]:
+                bars, report = normalize_bars(bars)
+                if not report.clean and symbol in wanted:
+                    print(json.dumps({"quality": {**asdict(report), "dropped": report.dropped}}), file=sys.stderr)
+            if symbol in wanted:
+                cache[key_for(symbol)] = bars
+            if store is not None:
+                store.save(dataset_name({**job, "resample": None}, symbol), BarColumns.from_bars(symbol, bars))
+
+    resample = job["resample"]
+    if not resample:
+        return {symbol: cache[key_for(symbol)] for symbol in job["symbols"]}
+    # Higher timeframes are derived from the cached base bars, never refetched
+    for symbol in job["symbols"]:
+        if key_for(symbol, resample) not in cache:
+            cache[key_for(symbol, resample)] = resample_bars(cache[key_for(symbol)], resample)
+    return {symbol: cache[key_for(symbol, resample)] for symbol in job["symbols"]}
+
+
+def stream_polygon_days(job: dict) -> Iterator[Dict[str, List[Bar]]]:
+    # Day-by-day fetch for out-of-core runs; nothing is cached across jobs
+    from .polygon_data import iter_polygon_day_chunks
+
+    api_key, base_url = polygon_api()
+    chunks = iter_polygon_day_chunks(
+        job["symbols"],
+        start=job["start"],
+        end=job["end"],
+        api_key=api_key,
+        multiplier=job["multiplier"],
+        timespan=job["timespan"],
+        base_url=base_url,
+    )
+    for chunk in chunks:
+        for symbol, bars in chunk.items():
+            if job["normalize"]:
+                bars, _ = normalize_bars(bars)
+            if job["resample"]:
+                bars = resample_bars(bars, job["resample"])
+            chunk[symbol] = bars
+        yield chunk
+
+
+def load_indicators(job: dict, symbol_to_bars: Dict[str, List[Bar]]) -> Dict[str, IndicatorArrays]:
+    store = IndicatorStore(job["cache_dir"])
+    return {
+        symbol: store.load(series_name(job, symbol), BarColumns.from_bars(symbol, bars))
+        for symbol, bars in symbol_to_bars.items()
+    }
+
+
+def run_job(job: dict, cache: BarCache, context_cache: SignalContextCache | None = None) -> dict:
+    unknown = sorted(set(job) - set(JOB_DEFAULTS))
+    if unknown:
+        raise ValueError(f"Unknown job keys: {', '.join(unknown)}")
+    job = {**JOB_DEFAULTS, **job}
+    if job["grouped_daily"]:
+        job.update(timespan="day", multiplier=1)
+    indicators = None
+    if job["stream_days"] and job["polygon"]:
+        symbols = stream_polygon_days(job)
+    else:
+        symbols = load_symbols(job, cache)
+        # Stored arrays are per loaded bar, so they do not apply to resampled contexts
+        if job["cache_dir"] and not job["context_timeframe"]:
+            indicators = load_indicators(job, symbols)
+    respect_schedule = job["respect_schedule"]
+    if respect_schedule is None:
+        respect_schedule = bool(job["polygon"])
+    sink = open_sink(job["output"], job["output_format"]) if job["output"] else None
+    journal = JournalWriter(job["journal"]) if job["journal"] else None
+    # Per-job rules live in the job's own Config, so nothing global is patched
+    config = DEFAULT_CONFIG.with_overrides(job["overrides"])
+    bt = StrategyBacktester(
+        account_equity=job["equity"],
+        respect_schedule=respect_schedule,
+        sink=sink,
+        retain_results=job["retain_results"],
+        journal=journal,
+        config=config,
+        context_cache=context_cache,
+        context_timeframe=job["context_timeframe"],
+    )
+    result = bt.run(symbols, indicators=indicators)
+    summary = bt.summarize()
+    if sink:
+        sink.close()
+    if journal:
+        journal.close()
+    return {
+        "trades": bt.trade_totals.count,
+        "days": len(result.dailies),
+        **summary,
+    }
+
+
+def run_batch(manifest_path: str) -> int:
+    # One warm process for every job: bars are loaded once per (symbol, range) and signal
+    # contexts computed once per bar series, then shared. A failing job prints an error line
+    # and the rest still run; returns the number of failed jobs.
+    with open(manifest_path) as fh:
+        manifest = json.load(fh)
+    defaults = manifest.get("defaults", {})
+    cache: BarCache = {}
+    contexts = SignalContextCache()
+    failed = 0
+    for i, job in enumerate(manifest.get("jobs", [])):
+        job = {**defaults, **job}
+        name = job.get("name") or f"job-{i}"
+        started = time.perf_counter()
+        try:
+            summary = run_job(job, cache, contexts)
+        except (ValueError, TypeError, KeyError, OSError) as exc:
+            failed += 1
+            print(json.dumps({"name": name, "error": f"{type(exc).__name__}: {exc}"}), flush=True)
+            continue
+        elapsed = time.perf_counter() - started
+        print(json.dumps({"name": name, "elapsed_s": round(elapsed, 3), **summary}), flush=True)
+    return failed
+
+
+def run_replay(path: str, fill_overrides: str | None) -> dict:
+    fill_rules = json.loads(fill_overrides) if fill_overrides else None
+    replayed = replay(path, fill_rules=fill_rules)
+    return {
+        "trades": len(replayed.trades),
+        "days": len(replayed.dailies),
+        "fills": replayed.fills,
+        "unfilled_under_rules": replayed.unfilled,
+        **asdict(replayed.metrics),
+    }
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run the VolatilityTrader backtest.")
+    parser.add_argument("--batch", default=None, help="Run every job in a JSON manifest in this process.")
+    parser.add_argument("--journal", default=None, help="Append decisions, orders, fills and equity marks to this journal.")
+    parser.add_argument("--replay", default=None, help="Rebuild trades and metrics from a journal instead of running.")
+    parser.add_argument(
+        "--replay-fill-rules",
+        default=None,
+        help='JSON fill-rule overrides to re-price recorded fills, e.g. \'{"slippage_bps": 10}\'.',
+    )
+    parser.add_argument(
+        "--serve",
+        default=None,
+        help="Warm the scanner with the selected symbols' bars and answer queries on this Unix socket.",
+    )
     parser.add_argument("--polygon", action="store_true", help="Fetch historical bars from Polygon.")
     parser.add_argument("--symbols", default="XYZ,ABC,DEF", help="Comma-separated list of symbols.")
     parser.add_argument("--start", default="2023-01-01", help="Start date for Polygon backtest (YYYY-MM-DD).")
     parser.add_argument("--end", default="2023-06-30", help="End date for Polygon backtest (YYYY-MM-DD).")
     parser.add_argument("--timespan", default="minute", help="Polygon timespan (minute, hour, day).")
     parser.add_argument("--multiplier", type=int, default=1, help="Polygon timespan multiplier.")
+    parser.add_argument(
+        "--resample",
+        default=None,
+        help="Aggregate loaded bars to a higher timeframe before the run (e.g. 5m, 15m, 60m, 1d).",
+    )
+    parser.add_argument(
+        "--context-timeframe",
+        default=None,
+        help="Compute signal indicators on completed bars of this timeframe (e.g. 1d), priced at the latest bar.",
+    )
+    parser.add_argument("--output", default=None, help="Directory to stream trades, fills, equity and positions into.")
+    parser.add_argument(
+        "--output-format",
+        choices=["csv", "columnar"],
+        default="csv",
+        help="File format for --output chunks.",
+    )
+    parser.add_argument(
+        "--no-retain-results",
+        dest="retain_results",
+        action="store_false",
+        help="Keep only running totals in memory; trades go to --output and --journal if given.",
+    )
+    parser.add_argument(
+        "--synthetic",
+        choices=["daily", "minute"],
+        default="daily",
+        help="Offline data: simple daily bars, or ET-aligned minute sessions from the GBM generator.",
+    )
+    parser.add_argument("--days", type=int, default=220, help="Sessions of offline data per symbol.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for offline data generation.")
+    parser.add_argument(
+        "--stream-days",
+        action="store_true",
+        help="With --polygon, fetch and backtest one day at a time, keeping only the indicator warmup in memory.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Persist fetched bars and computed indicator arrays here and reuse them on later runs.",
+    )
+    parser.add_argument(
+        "--grouped-daily",
+        action="store_true",
+        help="With --polygon, fetch daily bars with one whole-market request per day instead of per symbol.",
+    )
     parser.add_argument("--equity", type=float, default=100_000, help="Starting account equity.")
     parser.add_argument(
         "--respect-schedule",
@@ -52,30 +379,45 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    symbol_list = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
-    if args.polygon:
-        api_key = os.environ.get("POLYGON_API_KEY", "")
-        if not api_key:
-            raise SystemExit("POLYGON_API_KEY is not set. Add it to your environment before running.")
-        symbols = fetch_polygon_bars(
-            symbol_list,
-            start=args.start,
-            end=args.end,
-            api_key=api_key,
-            multiplier=args.multiplier,
-            timespan=args.timespan,
-        )
-        bt = StrategyBacktester(account_equity=args.equity, respect_schedule=True)
-    else:
-        symbols = {symbol: make_dummy_bars(symbol) for symbol in symbol_list}
-        bt = StrategyBacktester(account_equity=args.equity, respect_schedule=args.respect_schedule)
+    if args.batch:
+        if run_batch(args.batch):
+            raise SystemExit(1)
+        return
+    if args.replay:
+        print(run_replay(args.replay, args.replay_fill_rules))
+        return
 
-    result = bt.run(symbols)
-    print({
-        "trades": len(result.trades),
-        "days": len(result.dailies),
-        **bt.summarize(),
-    })
+    job = {
+        "symbols": [s.strip().upper() for s in args.symbols.split(",") if s.strip()],
+        "polygon": args.polygon,
+        "start": args.start,
+        "end": args.end,
+        "timespan": args.timespan,
+        "multiplier": args.multiplier,
+        "resample": args.resample,
+        "context_timeframe": args.context_timeframe,
+        "equity": args.equity,
+        "respect_schedule": True if args.polygon else args.respect_schedule,
+        "output": args.output,
+        "output_format": args.output_format,
+        "retain_results": args.retain_results,
+        "synthetic": args.synthetic,
+        "days": args.days,
+        "seed": args.seed,
+        "stream_days": args.stream_days,
+        "journal": args.journal,
+        "cache_dir": args.cache_dir,
+        "grouped_daily": args.grouped_daily,
+    }
+    if args.serve:
+        from .scanner_daemon import serve
+
+        try:
+            serve(args.serve, load_symbols({**JOB_DEFAULTS, **job}, {}))
+        except FileExistsError as exc:
+            raise SystemExit(str(exc))
+        return
+    print(run_job(job, {}))
 
 
 if __name__ == "__main__":
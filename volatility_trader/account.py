@@ -1,7 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Mapping
 from .types import Position
 from .config import RISK_RULES
 
@@ -14,10 +14,15 @@ class AccountState:
     trade_history: Dict[str, datetime] = field(default_factory=dict)
 
 
-def check_circuit_breakers(account: AccountState, open_positions: Dict[str, Position], current_time: datetime) -> str:
-    if account.equity > 0 and (account.daily_pnl / account.equity) < RISK_RULES["daily_loss_halt"]:
+def check_circuit_breakers(
+    account: AccountState,
+    open_positions: Dict[str, Position],
+    current_time: datetime,
+    rules: Mapping = RISK_RULES,
+) -> str:
+    if account.equity > 0 and (account.daily_pnl / account.equity) < rules["daily_loss_halt"]:
         return "HALT: Daily loss limit"
-    if len(open_positions) >= RISK_RULES["max_positions"]:
+    if len(open_positions) >= rules["max_positions"]:
         return "HALT: Max positions"
     for symbol, last_trade_time in account.trade_history.items():
         if (current_time - last_trade_time) < timedelta(hours=4):
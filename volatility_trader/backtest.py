@@ -1,19 +1,33 @@
 from __future__ import annotations
 import uuid
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
-from .types import Bar, Order, OrderType, Side, Position
+from .types import Bar, Fill, Order, OrderType, Side, Position
 from .signals import evaluate_breakout, evaluate_reversal, BREAKOUT
-from .scanner import build_signal_context, is_scan_time_et, within_entry_window, close_all_time
+from .scanner import (
+    DEFAULT_INDICATOR_PARAMS,
+    IndicatorParams,
+    AnySignalContext,
+    SignalContextCache,
+    priced_at,
+    is_scan_time_et,
+    within_entry_window,
+    close_all_time,
+)
 from .risk import calculate_shares, calculate_stop_loss, calculate_take_profit
-from .execution import ExecutionEngine
+from .execution import ExecutionEngine, solve_bracket_exit
 from .account import AccountState, check_circuit_breakers
-from .metrics import compute_metrics, Trade, Daily
-from .config import RISK_RULES, FILL_RULES, TRADING_SCHEDULE
+from .metrics import compute_metrics, Trade, TradeTotals, Daily
+from .config import DEFAULT_CONFIG, Config
 from .indicators import bollinger
+from .sinks import ResultSink
+from .journal import JournalWriter
+from .indicator_store import IndicatorArrays
+from .resample import StreamingResampler
 
 
 @dataclass
@@ -22,16 +36,216 @@ class BacktestResult:
     dailies: List[Daily]
 
 
+@dataclass
+class MarketStep:
+    # Everything about one timeline step that does not depend on a strategy's state
+    time: int
+    now: datetime
+    now_et: datetime
+    market_by_symbol: Dict[str, Dict[str, float]]
+    contexts: Dict[str, AnySignalContext]
+    # Per symbol, its bar history and how many of those bars are visible at this step
+    bar_ranges: Dict[str, Tuple[List[Bar], int]]
+    indicator_params: IndicatorParams = DEFAULT_INDICATOR_PARAMS
+    # Rows into precomputed indicator arrays, for symbols whose contexts came from them
+    indicator_rows: Dict[str, Tuple[IndicatorArrays, int]] = field(default_factory=dict)
+    # Per symbol, the higher-timeframe bars its context was computed from, when not bar_ranges
+    signal_ranges: Dict[str, Tuple[List[Bar], int]] = field(default_factory=dict)
+    _breakout_inputs: Dict[str, Tuple[bool, bool]] = field(default_factory=dict, repr=False)
+
+    def breakout_inputs(self, symbol: str) -> Tuple[bool, bool]:
+        # Computed on first use and shared by every strategy evaluating this step
+        inputs = self._breakout_inputs.get(symbol)
+        if inputs is None:
+            bars, end = self.signal_ranges.get(symbol) or self.bar_ranges[symbol]
+            row = self.indicator_rows.get(symbol)
+            if row:
+                squeeze = row[0].bb_width_is_low(row[1])
+            else:
+                # Only the last 20 band widths matter, so only their closes are read
+                tail = bars[max(0, end - self.indicator_params.bb_period - 19):end]
+                squeeze = _bb_width_is_20d_low(tail, self.indicator_params)
+            inputs = (squeeze, _todays_volume_gt_yday(bars[max(0, end - 2):end]))
+            self._breakout_inputs[symbol] = inputs
+        return inputs
+
+
+MarketData = Union[Mapping[str, List[Bar]], Iterable[Mapping[str, List[Bar]]]]
+IndicatorData = Mapping[str, IndicatorArrays]
+
+
+def default_warmup_bars(params: IndicatorParams = DEFAULT_INDICATOR_PARAMS) -> int:
+    # EMAs and Wilder averages never fully forget their seed; five slow-EMA spans leave
+    # its weight below 1e-4, which is the approximation chunked runs accept.
+    return 5 * max(params.ema_slow, params.bb_period + 20, params.rvol_lookback + 1)
+
+
+def iter_market_steps(
+    data: MarketData,
+    context_cache: SignalContextCache,
+    indicator_params: IndicatorParams = DEFAULT_INDICATOR_PARAMS,
+    market_tz: Optional[ZoneInfo] = None,
+    warmup_bars: Optional[int] = None,
+    indicators: Optional[IndicatorData] = None,
+    config: Config = DEFAULT_CONFIG,
+    context_timeframe: Optional[str] = None,
+) -> Iterator[MarketStep]:
+    # `data` is either every bar per symbol, or an iterator of time-ordered chunks (e.g. one
+    # per day). For chunks only the trailing `warmup_bars` per symbol are kept between chunks.
+    # Symbols with precomputed `indicators` read contexts from those arrays by bar time.
+    # With a `context_timeframe` (e.g. "1d") indicators are computed over completed bars of
+    # that timeframe, resampled as the bars stream in, and priced at the current bar.
+    indicators = indicators or {}
+    if indicators and context_timeframe:
+        raise ValueError("Precomputed indicators cannot be combined with a context timeframe")
+    for symbol, arrays in indicators.items():
+        if arrays.params != indicator_params:
+            raise ValueError(f"Indicator arrays for {symbol} were computed with other parameters: {arrays.params}")
+    market_tz = market_tz or config.market_tz
+    spread_fraction = config.spread_fraction
+    if isinstance(data, Mapping):
+        chunks: Iterable[Mapping[str, List[Bar]]] = [data]
+    else:
+        chunks = data
+        if warmup_bars is None:
+            warmup_bars = default_warmup_bars(indicator_params)
+
+    # A single mapping is never extended, so its (sorted) lists are read in place. Lazy
+    # contexts are keyed on those lists, so runs over the same lists share cache entries.
+    in_place = isinstance(data, Mapping)
+    histories: Dict[str, List[Bar]] = {}
+    resamplers: Dict[str, StreamingResampler] = {}
+    higher: Dict[str, List[Bar]] = {}
+    for chunk in chunks:
+        # Build a global timeline of all bar times in this chunk
+        all_times = sorted({b.time for bars in chunk.values() for b in bars})
+        # Index bars per symbol by time
+        bars_by_symbol_time: Dict[str, Dict[int, Bar]] = {
+            symbol: {b.time: b for b in bars}
+            for symbol, bars in chunk.items()
+        }
+        # Bars before the chunk's first step are already history
+        seen: Dict[str, int] = {}
+        for symbol, bars in chunk.items():
+            if in_place:
+                ordered = all(a.time <= b.time for a, b in zip(bars, bars[1:]))
+                histories[symbol] = bars if ordered else sorted(bars, key=lambda b: b.time)
+                seen[symbol] = 0
+                continue
+            history = histories.setdefault(symbol, [])
+            seen[symbol] = len(history)
+            history.extend(sorted(bars, key=lambda b: b.time))
+
+        for t in all_times:
+            now = datetime.fromtimestamp(t, tz=timezone.utc)
+            now_et = now.astimezone(market_tz)
+            market_by_symbol: Dict[str, Dict[str, float]] = {}
+            contexts: Dict[str, AnySignalContext] = {}
+            bar_ranges: Dict[str, Tuple[List[Bar], int]] = {}
+            indicator_rows: Dict[str, Tuple[IndicatorArrays, int]] = {}
+            signal_ranges: Dict[str, Tuple[List[Bar], int]] = {}
+            for symbol, full in histories.items():
+                # Advance to the rolling history up to time t for indicators
+                end = seen.get(symbol, len(full))
+                while end < len(full) and full[end].time <= t:
+                    end += 1
+                seen[symbol] = end
+                current_bar = bars_by_symbol_time.get(symbol, {}).get(t)
+                if not current_bar:
+                    continue
+                arrays = indicators.get(symbol)
+                row = arrays.index_of(t) if arrays is not None else None
+                if context_timeframe:
+                    resampler = resamplers.get(symbol)
+                    if resampler is None:
+                        resampler = resamplers[symbol] = StreamingResampler(symbol, context_timeframe)
+                        higher[symbol] = []
+                    completed = resampler.update(current_bar)
+                    if completed is not None:
+                        higher[symbol].append(completed)
+                    bars = higher[symbol]
+                    ctx = context_cache.get_lazy(symbol, bars, len(bars), indicator_params)
+                    if ctx is not None:
+                        ctx = priced_at(ctx, current_bar.close)
+                        signal_ranges[symbol] = (bars, len(bars))
+                elif row is not None and arrays.close[row] == current_bar.close:
+                    ctx = arrays.context_at(row)
+                    indicator_rows[symbol] = (arrays, row)
+                else:
+                    ctx = context_cache.get_lazy(symbol, full, end, indicator_params)
+                if ctx is None:
+                    continue
+
+                # Prepare market snapshot for fills and OCO monitoring
+                spread = ctx.price * spread_fraction
+                market_by_symbol[symbol] = {
+                    "bid": ctx.price - (spread / 2),
+                    "ask": ctx.price + (spread / 2),
+                    "last": ctx.price,
+                    "volume": current_bar.volume,
+                    "time": t,
+                }
+                contexts[symbol] = ctx
+                bar_ranges[symbol] = (full, end)
+            yield MarketStep(
+                t, now, now_et, market_by_symbol, contexts, bar_ranges, indicator_params, indicator_rows, signal_ranges
+            )
+
+        if warmup_bars is not None:
+            # Rebound rather than trimmed in place, since lazy contexts read the old lists.
+            # Those contexts are never looked up again, so the cache lets go of them.
+            for symbol, history in histories.items():
+                context_cache.release(history)
+                histories[symbol] = history[-warmup_bars:]
+            for symbol, bars in higher.items():
+                context_cache.release(bars)
+                higher[symbol] = bars[-warmup_bars:]
+
+
 class StrategyBacktester:
-    def __init__(self, account_equity: float, respect_schedule: bool = True):
-        self.engine = ExecutionEngine()
+    def __init__(
+        self,
+        account_equity: float,
+        respect_schedule: bool = True,
+        sink: Optional[ResultSink] = None,
+        retain_results: bool = True,
+        context_cache: Optional[SignalContextCache] = None,
+        indicator_params: IndicatorParams = DEFAULT_INDICATOR_PARAMS,
+        strategy_rules: Optional[dict] = None,
+        journal: Optional[JournalWriter] = None,
+        config: Config = DEFAULT_CONFIG,
+        context_timeframe: Optional[str] = None,
+    ):
+        # `strategy_rules`, if given, are merged over the config's strategy rules.
+        # `context_timeframe` selects the bars signals are computed on (see iter_market_steps).
+        if strategy_rules:
+            config = config.with_overrides({"strategy_rules": strategy_rules})
+        self.config = config
+        self.journal = journal
+        self.engine = ExecutionEngine(journal=journal, config=config)
         self.account = AccountState(equity=account_equity, cash=account_equity)
         self.positions: Dict[str, Position] = {}
         self.trades: List[Trade] = []
         self.dailies: List[Daily] = []
         self.slippage_samples: List[float] = []
         self.respect_schedule = respect_schedule
-        self.market_tz = ZoneInfo(TRADING_SCHEDULE.get("timezone", "US/Eastern"))
+        self.market_tz = config.market_tz
+        # With a sink attached, trades can be streamed out instead of kept in memory;
+        # summarize() works from running totals either way
+        self.sink = sink
+        self.retain_results = retain_results
+        self.trade_totals = TradeTotals()
+        self.context_cache = context_cache if context_cache is not None else SignalContextCache()
+        self.indicator_params = indicator_params
+        self.context_timeframe = context_timeframe
+        self.strategy_rules = config.strategy_rules
+        self.risk_rules = config.risk_rules
+        self._slip_factor = 1 + config.slippage_fraction
+        # Bar time at which each open OCO group is solved to exit (None: check every bar)
+        self._exit_due: Dict[str, Optional[int]] = {}
+        self._forward: Dict[str, Tuple[List[Bar], array, array]] = {}
+        self._last_day: Optional[Tuple[int, int, int]] = None
+        self._last_time: Optional[int] = None
 
     def _current_price(self, symbol: str, market_by_symbol: Dict[str, Dict[str, float]]) -> Optional[float]:
         m = market_by_symbol.get(symbol)
@@ -50,8 +264,8 @@ class StrategyBacktester:
         price = self._current_price(symbol, market_by_symbol)
         if price is None:
             return False
-        per_symbol_limit = RISK_RULES["per_symbol_max"]
-        gross_limit = RISK_RULES["max_gross_exposure"]
+        per_symbol_limit = self.risk_rules["per_symbol_max"]
+        gross_limit = self.risk_rules["max_gross_exposure"]
 
         new_value = price * new_qty
         # Per-symbol limit
@@ -75,177 +289,177 @@ class StrategyBacktester:
             equity += price * pos.quantity
         self.account.equity = equity
 
-    def run(self, symbol_to_bars: Dict[str, List[Bar]]) -> BacktestResult:
-        # Build a global timeline of all bar times
-        all_times = sorted({b.time for bars in symbol_to_bars.values() for b in bars})
-        # Index bars per symbol by time
-        bars_by_symbol_time: Dict[str, Dict[int, Bar]] = {
-            symbol: {b.time: b for b in bars}
-            for symbol, bars in symbol_to_bars.items()
-        }
-
-        last_day: Optional[Tuple[int, int, int]] = None
-        for t in all_times:
-            now = datetime.fromtimestamp(t, tz=timezone.utc)
-            now_et = now.astimezone(self.market_tz)
-            # Construct per-symbol rolling history up to time t for indicators
-            market_by_symbol: Dict[str, Dict[str, float]] = {}
-            for symbol, bars in symbol_to_bars.items():
-                # Build current history up to t
-                history = [b for b in bars if b.time <= t]
-                if len(history) < 200:
-                    continue
-                ctx = build_signal_context(history)
-                if ctx is None:
+    def run(
+        self,
+        symbol_to_bars: MarketData,
+        warmup_bars: Optional[int] = None,
+        indicators: Optional[IndicatorData] = None,
+    ) -> BacktestResult:
+        steps = iter_market_steps(
+            symbol_to_bars,
+            self.context_cache,
+            self.indicator_params,
+            self.market_tz,
+            warmup_bars,
+            indicators,
+            self.config,
+            self.context_timeframe,
+        )
+        for step in steps:
+            self.step(step)
+        return self.finish()
+
+    def step(self, step: MarketStep) -> None:
+        t = step.time
+        now = step.now
+        now_et = step.now_et
+        market_by_symbol = step.market_by_symbol
+
+        # Recompute equity with the latest prices available
+        self._recompute_equity(market_by_symbol)
+
+        # After we have market snapshots, evaluate entries per symbol
+        for symbol, ctx in step.contexts.items():
+            if self.respect_schedule:
+                if not within_entry_window(now_et, self.config) or not is_scan_time_et(now_et, self.config):
                     continue
-                current_bar = bars_by_symbol_time[symbol].get(t)
-                if not current_bar:
-                    continue
-
-                # Prepare market snapshot for fills and OCO monitoring
-                spread_bps = FILL_RULES["min_spread_bps"]
-                spread = ctx.price * (spread_bps / 10000)
-                market_by_symbol[symbol] = {
-                    "bid": ctx.price - (spread / 2),
-                    "ask": ctx.price + (spread / 2),
-                    "last": ctx.price,
-                    "volume": current_bar.volume,
-                    "time": t,
-                }
-
-            # Recompute equity with the latest prices available
-            self._recompute_equity(market_by_symbol)
+            status = check_circuit_breakers(self.account, self.positions, now, self.risk_rules)
+            if status != "OK":
+                continue
 
-            # After we have market snapshots, evaluate entries per symbol
-            for symbol, bars in symbol_to_bars.items():
-                history = [b for b in bars if b.time <= t]
-                if len(history) < 200 or symbol not in market_by_symbol:
-                    continue
-                ctx = build_signal_context(history)
-                if ctx is None:
+            # Breakout inputs are only worked out for bars that get past the cheaper gates
+            decision = evaluate_breakout(
+                ctx,
+                bb_width_is_20d_low=lambda: step.breakout_inputs(symbol)[0],
+                todays_volume_gt_yday=lambda: step.breakout_inputs(symbol)[1],
+                rules=self.strategy_rules,
+            )
+            if not decision.should_enter:
+                decision = evaluate_reversal(ctx, rules=self.strategy_rules)
+            if self.journal:
+                self.journal.decision(t, symbol, decision)
+
+            if decision.should_enter and symbol not in self.positions:
+                atr = ctx.atr_percent * ctx.price / 100
+                stop = calculate_stop_loss(decision.signal_type or BREAKOUT, ctx.price, atr, self.strategy_rules)
+                tp = calculate_take_profit(ctx.price, stop, decision.signal_type or BREAKOUT, self.strategy_rules)
+                # Position size by risk and cash/exposure constraints
+                qty = calculate_shares(
+                    self.account.equity,
+                    ctx.price,
+                    stop,
+                    self.risk_rules.get("risk_fraction", 0.01),
+                )
+                # Cap by available cash using conservative fill estimate (ask + slippage)
+                ask = market_by_symbol[symbol]["ask"]
+                est_fill_per_share = ask * self._slip_factor if ask > 0 else ctx.price
+                if est_fill_per_share > 0:
+                    max_qty_by_cash = int(self.account.cash // est_fill_per_share)
+                    qty = max(0, min(qty, max_qty_by_cash))
+                if qty <= 0:
                     continue
-                if self.respect_schedule:
-                    if not within_entry_window(now_et) or not is_scan_time_et(now_et):
-                        continue
-                status = check_circuit_breakers(self.account, self.positions, now)
-                if status != "OK":
+                if not self._check_position_limits(symbol, qty, market_by_symbol):
                     continue
 
-                bb_width_is_20d_low = _bb_width_is_20d_low(history)
-                todays_volume_gt_yday = _todays_volume_gt_yday(history)
-                decision = evaluate_breakout(
-                    ctx,
-                    bb_width_is_20d_low=bb_width_is_20d_low,
-                    todays_volume_gt_yday=todays_volume_gt_yday,
-                )
-                if not decision.should_enter:
-                    decision = evaluate_reversal(ctx)
-
-                if decision.should_enter and symbol not in self.positions:
-                    atr = ctx.atr_percent * ctx.price / 100
-                    stop = calculate_stop_loss(decision.signal_type or BREAKOUT, ctx.price, atr)
-                    tp = calculate_take_profit(ctx.price, stop, decision.signal_type or BREAKOUT)
-                    # Position size by risk and cash/exposure constraints
-                    qty = calculate_shares(
-                        self.account.equity,
-                        ctx.price,
-                        stop,
-                        RISK_RULES.get("risk_fraction", 0.01),
-                    )
-                    # Cap by available cash using conservative fill estimate (ask + slippage)
-                    ask = market_by_symbol[symbol]["ask"]
-                    slip_factor = 1 + (FILL_RULES["slippage_bps"] / 10000)
-                    est_fill_per_share = ask * slip_factor if ask > 0 else ctx.price
-                    if est_fill_per_share > 0:
-                        max_qty_by_cash = int(self.account.cash // est_fill_per_share)
-                        qty = max(0, min(qty, max_qty_by_cash))
-                    if qty <= 0:
-                        continue
-                    if not self._check_position_limits(symbol, qty, market_by_symbol):
-                        continue
-
-                    entry = Order(symbol=symbol, side=Side.BUY, quantity=qty, order_type=OrderType.MARKET)
-                    fill = self.engine.simulate_fill(entry, market_by_symbol[symbol])
-                    if not fill:
-                        continue
-
-                    # Open position
-                    # Deduct cash for the purchase
-                    oco_id = str(uuid.uuid4())
-                    self.account.cash -= fill.price * fill.filled_qty
-                    self.positions[symbol] = Position(
-                        symbol=symbol,
-                        quantity=fill.filled_qty,
-                        avg_price=fill.price,
-                        stop_price=stop,
-                        take_profit=tp,
-                        oco_group=oco_id,
-                        entry_time=t,
-                        bars_held=0,
-                        peak_unrealized=0.0,
-                        max_drawdown_unrealized=0.0,
-                        time_in_drawdown_bars=0,
-                        last_price=fill.price,
-                    )
-                    # Update trade history for cooldown logic
-                    self.account.trade_history[symbol] = now
-                    # Register OCO orders for continuous monitoring
-                    stop_order = Order(symbol=symbol, side=Side.SELL, quantity=qty, order_type=OrderType.LIMIT, price=stop, oco_group=oco_id)
-                    tp_order = Order(symbol=symbol, side=Side.SELL, quantity=qty, order_type=OrderType.LIMIT, price=tp, oco_group=oco_id)
-                    self.engine.register_oco(stop_order, tp_order)
-
-            # Continuous monitoring of OCOs across symbols at this time step
-            fills = self.engine.check_open_orders(market_by_symbol)
-            for fill in fills:
-                symbol = fill.order.symbol
-                pos = self.positions.get(symbol)
-                if not pos:
+                entry = Order(symbol=symbol, side=Side.BUY, quantity=qty, order_type=OrderType.MARKET)
+                fill = self.engine.simulate_fill(entry, market_by_symbol[symbol])
+                if not fill:
                     continue
-                # Compute PnL, close position, record trade
-                pnl = (fill.price - pos.avg_price) * pos.quantity
-                trade = Trade(
-                    pnl=pnl,
-                    adhered_to_plan=True,
-                    entry_time=pos.entry_time,
-                    exit_time=fill.time,
-                    duration_bars=pos.bars_held,
-                    time_in_drawdown_bars=pos.time_in_drawdown_bars,
+                if self.sink:
+                    self.sink.write_fill(fill)
+
+                # Open position
+                # Deduct cash for the purchase
+                oco_id = str(uuid.uuid4())
+                self.account.cash -= fill.price * fill.filled_qty
+                self.positions[symbol] = Position(
+                    symbol=symbol,
+                    quantity=fill.filled_qty,
+                    avg_price=fill.price,
+                    stop_price=stop,
+                    take_profit=tp,
+                    oco_group=oco_id,
+                    entry_time=t,
+                    bars_held=0,
+                    peak_unrealized=0.0,
+                    max_drawdown_unrealized=0.0,
+                    time_in_drawdown_bars=0,
+                    last_price=fill.price,
                 )
-                self.trades.append(trade)
-                self.account.daily_pnl += pnl
-                # Add back sale proceeds
-                self.account.cash += fill.price * pos.quantity
-                del self.positions[symbol]
-
-            if self.respect_schedule and close_all_time(now_et):
-                self._close_all_positions(market_by_symbol)
-
-            # Update open position metrics with latest market prices
-            for symbol, pos in list(self.positions.items()):
-                m = market_by_symbol.get(symbol)
-                if not m:
-                    continue
-                last = m["last"]
-                pos.bars_held += 1
-                pos.last_price = last
-                unrealized = (last - pos.avg_price) * pos.quantity
-                pos.peak_unrealized = max(pos.peak_unrealized, unrealized)
-                dd = pos.peak_unrealized - unrealized
-                if dd > 0:
-                    pos.time_in_drawdown_bars += 1
-                    pos.max_drawdown_unrealized = max(pos.max_drawdown_unrealized, dd)
-
-            # Daily rollover handling: record and reset when the day changes
-            day_tuple = datetime.fromtimestamp(t, tz=timezone.utc).date().timetuple()[:3]
-            if last_day is None:
-                last_day = day_tuple
-            elif day_tuple != last_day:
-                self.dailies.append(Daily(pnl=self.account.daily_pnl))
-                self.account.daily_pnl = 0.0
-                last_day = day_tuple
+                # Update trade history for cooldown logic
+                self.account.trade_history[symbol] = now
+                # Register OCO orders for continuous monitoring
+                stop_order = Order(symbol=symbol, side=Side.SELL, quantity=qty, order_type=OrderType.LIMIT, price=stop, oco_group=oco_id)
+                tp_order = Order(symbol=symbol, side=Side.SELL, quantity=qty, order_type=OrderType.LIMIT, price=tp, oco_group=oco_id)
+                self.engine.register_oco(stop_order, tp_order)
+                bars, end = step.bar_ranges[symbol]
+                self._exit_due[oco_id] = self._solve_exit_time(symbol, bars, end - 1, stop, tp)
+
+        # Continuous monitoring of OCOs, limited to the groups due to exit at this step
+        due = [group for group, when in self._exit_due.items() if when is None or when <= t]
+        fills = self.engine.check_open_orders(market_by_symbol, due)
+        for group in due:
+            orders = self.engine.open_oco_groups.get(group)
+            if orders is None:
+                del self._exit_due[group]
+            elif self._exit_due[group] is not None:
+                # Triggered without enough volume to fill; look for the next trigger
+                stop_order, tp_order = orders
+                loaded = step.bar_ranges.get(stop_order.symbol)
+                self._exit_due[group] = (
+                    self._solve_exit_time(stop_order.symbol, loaded[0], loaded[1], stop_order.price, tp_order.price)
+                    if loaded
+                    else None
+                )
+        for fill in fills:
+            symbol = fill.order.symbol
+            pos = self.positions.get(symbol)
+            if not pos:
+                continue
+            self._record_exit(pos, fill)
+
+        if self.respect_schedule and close_all_time(now_et, self.config):
+            self._close_all_positions(market_by_symbol)
 
+        # Update open position metrics with latest market prices
+        for symbol, pos in list(self.positions.items()):
+            m = market_by_symbol.get(symbol)
+            if not m:
+                continue
+            last = m["last"]
+            pos.bars_held += 1
+            pos.last_price = last
+            unrealized = (last - pos.avg_price) * pos.quantity
+            pos.peak_unrealized = max(pos.peak_unrealized, unrealized)
+            dd = pos.peak_unrealized - unrealized
+            if dd > 0:
+                pos.time_in_drawdown_bars += 1
+                pos.max_drawdown_unrealized = max(pos.max_drawdown_unrealized, dd)
+            if self.sink:
+                self.sink.write_position(t, pos)
+
+        if self.sink:
+            self.sink.write_equity(t, self.account.equity, self.account.cash, self.account.daily_pnl)
+        if self.journal:
+            self.journal.equity(t, self.account.equity, self.account.cash, self.account.daily_pnl)
+
+        # Daily rollover handling: record and reset when the day changes
+        day_tuple = now.date().timetuple()[:3]
+        if self._last_day is None:
+            self._last_day = day_tuple
+        elif day_tuple != self._last_day:
+            self._record_day()
+            self.account.daily_pnl = 0.0
+            self._last_day = day_tuple
+        self._last_time = t
+
+    def finish(self) -> BacktestResult:
         # Close out final day's daily PnL record
-        self.dailies.append(Daily(pnl=self.account.daily_pnl))
+        self._record_day()
+        if self.sink:
+            self.sink.flush()
+        if self.journal:
+            self.journal.flush()
 
         return BacktestResult(trades=self.trades, dailies=self.dailies)
 
@@ -258,24 +472,67 @@ class StrategyBacktester:
             fill = self.engine.simulate_fill(order, market)
             if not fill:
                 continue
-            pnl = (fill.price - pos.avg_price) * pos.quantity
-            trade = Trade(
-                pnl=pnl,
-                adhered_to_plan=True,
-                entry_time=pos.entry_time,
-                exit_time=fill.time,
-                duration_bars=pos.bars_held,
-                time_in_drawdown_bars=pos.time_in_drawdown_bars,
-            )
-            self.trades.append(trade)
-            self.account.daily_pnl += pnl
-            self.account.cash += fill.price * pos.quantity
             if pos.oco_group:
                 self.engine.cancel_oco_group(pos.oco_group)
-            del self.positions[symbol]
+                self._exit_due.pop(pos.oco_group, None)
+            self._record_exit(pos, fill)
+
+    def _solve_exit_time(
+        self,
+        symbol: str,
+        bars: List[Bar],
+        start: int,
+        stop: Optional[float],
+        tp: Optional[float],
+    ) -> Optional[int]:
+        # Time of the next bar from `start` on which the bracket triggers, among the bars
+        # already loaded. The engine still applies the volume rule when that bar is checked.
+        # When none is found (e.g. the rest of a chunked run is not loaded yet) the group
+        # is checked every bar.
+        cached = self._forward.get(symbol)
+        if cached is None or cached[0] is not bars:
+            cached = (bars, array("d"), array("d"))
+            self._forward[symbol] = cached
+        _, closes, volumes = cached
+        if len(closes) < len(bars):
+            tail = bars[len(closes):]
+            closes.extend([b.close for b in tail])
+            volumes.extend([b.volume for b in tail])
+        exit_ = solve_bracket_exit(closes, volumes, stop, tp, start=start, participation=None)
+        return bars[exit_.index].time if exit_ else None
+
+    def _record_day(self) -> None:
+        self.dailies.append(Daily(pnl=self.account.daily_pnl, time=self._last_time))
+        if self.journal:
+            self.journal.day(self._last_time or 0, self.account.daily_pnl)
+
+    def _record_exit(self, pos: Position, fill: Fill) -> None:
+        # Compute PnL, close position, record trade
+        pnl = (fill.price - pos.avg_price) * pos.quantity
+        trade = Trade(
+            pnl=pnl,
+            adhered_to_plan=True,
+            entry_time=pos.entry_time,
+            exit_time=fill.time,
+            duration_bars=pos.bars_held,
+            time_in_drawdown_bars=pos.time_in_drawdown_bars,
+            symbol=pos.symbol,
+        )
+        self.trade_totals.add(trade)
+        if self.retain_results:
+            self.trades.append(trade)
+        if self.sink:
+            self.sink.write_fill(fill)
+            self.sink.write_trade(trade)
+        if self.journal:
+            self.journal.close_position(fill.time, pos.symbol, pos.bars_held, pos.time_in_drawdown_bars)
+        self.account.daily_pnl += pnl
+        # Add back sale proceeds
+        self.account.cash += fill.price * pos.quantity
+        del self.positions[pos.symbol]
 
     def summarize(self) -> dict:
-        m = compute_metrics(self.trades, self.dailies, self.slippage_samples)
+        m = compute_metrics(self.trades, self.dailies, self.slippage_samples, self.trade_totals)
         return {
             "win_rate": m.win_rate,
             "profit_factor": m.profit_factor,
@@ -290,9 +547,9 @@ class StrategyBacktester:
         }
 
 
-def _bb_width_is_20d_low(history: List[Bar]) -> bool:
+def _bb_width_is_20d_low(history: List[Bar], params: IndicatorParams = DEFAULT_INDICATOR_PARAMS) -> bool:
     closes = [b.close for b in history]
-    lower, _, upper = bollinger(closes, 20, 2.0)
+    lower, _, upper = bollinger(closes, params.bb_period, params.bb_std)
     if len(lower) < 20 or len(upper) < 20:
         return False
     widths = []
@@ -1,5 +1,8 @@
-from dataclasses import dataclass, field
-from typing import Literal
+from dataclasses import dataclass, field, replace
+from datetime import time
+from types import MappingProxyType
+from typing import Mapping, Tuple
+from zoneinfo import ZoneInfo
 
 FILL_RULES = {
     "limit_offset_bps": 15,
@@ -16,6 +19,16 @@ RISK_RULES = {
     "daily_loss_halt": -0.03,
 }
 
+STRATEGY_RULES = {
+    "required_rvol": 1.8,
+    "required_atr_pct": 4.0,
+    "reversal_rsi_max": 35,
+    "breakout_stop_atr": 2.0,
+    "reversal_stop_atr": 1.5,
+    "breakout_reward_risk": 3.0,
+    "reversal_reward_risk": 2.5,
+}
+
 TRADING_SCHEDULE = {
     "scan_times_et": ["09:45", "11:00", "13:00", "14:30"],
     "no_new_after_et": "15:00",
@@ -24,9 +37,70 @@ TRADING_SCHEDULE = {
 }
 
 
+def _seconds_of_day(hhmm: str) -> int:
+    t = time.fromisoformat(hhmm)
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _freeze(value):
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+RULE_SETS = ("fill_rules", "risk_rules", "strategy_rules", "trading_schedule")
+
+
 @dataclass(frozen=True)
 class Config:
-    fill_rules: dict = field(default_factory=lambda: FILL_RULES.copy())
-    risk_rules: dict = field(default_factory=lambda: RISK_RULES.copy())
-    trading_schedule: dict = field(default_factory=lambda: TRADING_SCHEDULE.copy())
-    timezone: Literal["US/Eastern"] = "US/Eastern"
+    # One immutable bundle of rules per run. Rule tables are copied into read-only
+    # mappings and the values the hot loop needs are derived once here.
+    fill_rules: Mapping = field(default_factory=lambda: FILL_RULES.copy())
+    risk_rules: Mapping = field(default_factory=lambda: RISK_RULES.copy())
+    strategy_rules: Mapping = field(default_factory=lambda: STRATEGY_RULES.copy())
+    trading_schedule: Mapping = field(default_factory=lambda: TRADING_SCHEDULE.copy())
+
+    market_tz: ZoneInfo = field(init=False, repr=False, compare=False)
+    scan_seconds_et: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+    no_new_after_seconds_et: int = field(init=False, repr=False, compare=False)
+    close_all_by_seconds_et: int = field(init=False, repr=False, compare=False)
+    spread_fraction: float = field(init=False, repr=False, compare=False)
+    slippage_fraction: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Unknown keys pass through; missing ones fall back to the module defaults
+        defaults = {
+            "fill_rules": FILL_RULES,
+            "risk_rules": RISK_RULES,
+            "strategy_rules": STRATEGY_RULES,
+            "trading_schedule": TRADING_SCHEDULE,
+        }
+        for name in RULE_SETS:
+            object.__setattr__(self, name, MappingProxyType({**defaults[name], **getattr(self, name)}))
+        schedule = self.trading_schedule
+        derived = {
+            "market_tz": ZoneInfo(schedule["timezone"]),
+            "scan_seconds_et": tuple(_seconds_of_day(t) for t in schedule["scan_times_et"]),
+            "no_new_after_seconds_et": _seconds_of_day(schedule["no_new_after_et"]),
+            "close_all_by_seconds_et": _seconds_of_day(schedule["close_all_by_et"]),
+            "spread_fraction": self.fill_rules["min_spread_bps"] / 10000,
+            "slippage_fraction": self.fill_rules["slippage_bps"] / 10000,
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+
+    def __hash__(self) -> int:
+        # Rule tables are read-only proxies, which do not hash; hash their frozen contents
+        return hash(tuple((name, _freeze(getattr(self, name))) for name in RULE_SETS))
+
+    def with_overrides(self, overrides: Mapping[str, Mapping]) -> "Config":
+        # e.g. {"risk_rules": {"max_positions": 1}}; each table is merged key by key
+        unknown = set(overrides) - set(RULE_SETS)
+        if unknown:
+            raise ValueError(f"Unsupported overrides: {sorted(unknown)}")
+        return replace(self, **{name: {**getattr(self, name), **values} for name, values in overrides.items()})
+
+
+DEFAULT_CONFIG = Config()
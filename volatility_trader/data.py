@@ -1,7 +1,144 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, List
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
 from .types import Bar
+from .config import TRADING_SCHEDULE
+
+
+@dataclass
+class BarColumns:
+    symbol: str
+    time: array = field(default_factory=lambda: array("q"))
+    open: array = field(default_factory=lambda: array("d"))
+    high: array = field(default_factory=lambda: array("d"))
+    low: array = field(default_factory=lambda: array("d"))
+    close: array = field(default_factory=lambda: array("d"))
+    volume: array = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def append(self, bar: Bar) -> None:
+        self.time.append(int(bar.time))
+        self.open.append(bar.open)
+        self.high.append(bar.high)
+        self.low.append(bar.low)
+        self.close.append(bar.close)
+        self.volume.append(bar.volume)
+
+    @classmethod
+    def from_bars(cls, symbol: str, bars: Iterable[Bar]) -> "BarColumns":
+        bars = list(bars)
+        return cls(
+            symbol=symbol,
+            time=array("q", [int(b.time) for b in bars]),
+            open=array("d", [b.open for b in bars]),
+            high=array("d", [b.high for b in bars]),
+            low=array("d", [b.low for b in bars]),
+            close=array("d", [b.close for b in bars]),
+            volume=array("d", [b.volume for b in bars]),
+        )
+
+    def content_hash(self, rows: Optional[int] = None) -> str:
+        # Hash of the first `rows` bars (all by default) across every column
+        n = len(self) if rows is None else rows
+        h = hashlib.sha256(self.symbol.encode("utf-8"))
+        for col in (self.time, self.open, self.high, self.low, self.close, self.volume):
+            h.update(memoryview(col)[:n])
+        return h.hexdigest()
+
+    def to_bars(self) -> List[Bar]:
+        return [
+            Bar(self.symbol, t, o, h, l, c, v)
+            for t, o, h, l, c, v in zip(self.time, self.open, self.high, self.low, self.close, self.volume)
+        ]
+
+
+COLUMN_FILE_MAGIC = b"VTCOLF1\n"
+_ALIGN = 8
+
+
+def write_column_file(path: str, header: dict, columns: Dict[str, array]) -> None:
+    # Layout: magic, header length, JSON header, padding, then each column's raw buffer
+    # at an 8-byte aligned offset so readers can memory-map it without copying.
+    names = list(columns)
+    meta = {**header, "columns": [[name, columns[name].typecode, len(columns[name])] for name in names]}
+    blob = json.dumps(meta).encode("utf-8")
+    prefix = len(COLUMN_FILE_MAGIC) + 4 + len(blob)
+    pad = (-prefix) % _ALIGN
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(COLUMN_FILE_MAGIC)
+        fh.write(struct.pack("<I", len(blob) + pad))
+        fh.write(blob)
+        fh.write(b" " * pad)
+        for name in names:
+            data = columns[name].tobytes()
+            fh.write(data)
+            fh.write(b"\0" * ((-len(data)) % _ALIGN))
+    os.replace(tmp, path)
+
+
+def map_column_file(path: str) -> Tuple[dict, Dict[str, Sequence]]:
+    # Columns come back as memoryviews over a read-only mapping of the file
+    with open(path, "rb") as fh:
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[: len(COLUMN_FILE_MAGIC)] != COLUMN_FILE_MAGIC:
+        raise ValueError(f"Not a column file: {path}")
+    (header_len,) = struct.unpack_from("<I", mapped, len(COLUMN_FILE_MAGIC))
+    start = len(COLUMN_FILE_MAGIC) + 4
+    header = json.loads(bytes(mapped[start:start + header_len]).decode("utf-8"))
+    offset = start + header_len
+    view = memoryview(mapped)
+    columns: Dict[str, Sequence] = {}
+    for name, typecode, length in header.pop("columns"):
+        nbytes = length * array(typecode).itemsize
+        columns[name] = view[offset:offset + nbytes].cast(typecode)
+        offset += nbytes + (-nbytes) % _ALIGN
+    return header, columns
+
+
+class BarStore:
+    # One column file of bars per dataset name under `root`; derived caches live beside it
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.root, f"{name}.bars")
+
+    def save(self, name: str, cols: BarColumns) -> None:
+        columns = {
+            "time": cols.time,
+            "open": cols.open,
+            "high": cols.high,
+            "low": cols.low,
+            "close": cols.close,
+            "volume": cols.volume,
+        }
+        write_column_file(self.path(name), {"symbol": cols.symbol}, columns)
+
+    def load(self, name: str) -> Optional[BarColumns]:
+        if not os.path.exists(self.path(name)):
+            return None
+        header, columns = map_column_file(self.path(name))
+        return BarColumns(
+            symbol=header["symbol"],
+            time=array("q", columns["time"]),
+            open=array("d", columns["open"]),
+            high=array("d", columns["high"]),
+            low=array("d", columns["low"]),
+            close=array("d", columns["close"]),
+            volume=array("d", columns["volume"]),
+        )
 
 
 @dataclass
@@ -10,3 +147,18 @@ class InMemoryData:
 
     def get_bars(self, symbol: str) -> List[Bar]:
         return self.symbol_to_bars.get(symbol, [])
+
+
+def iter_day_chunks(
+    symbol_to_bars: Dict[str, List[Bar]],
+    tz: str = TRADING_SCHEDULE.get("timezone", "US/Eastern"),
+) -> Iterator[Dict[str, List[Bar]]]:
+    # Splits in-memory bars into per-day chunks in the shape StrategyBacktester.run streams
+    zone = ZoneInfo(tz)
+    by_day: Dict[object, Dict[str, List[Bar]]] = {}
+    for symbol, bars in symbol_to_bars.items():
+        for bar in bars:
+            day = datetime.fromtimestamp(bar.time, tz=timezone.utc).astimezone(zone).date()
+            by_day.setdefault(day, {}).setdefault(symbol, []).append(bar)
+    for day in sorted(by_day):
+        yield by_day.pop(day)
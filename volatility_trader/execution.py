@@ -1,20 +1,43 @@
 from __future__ import annotations
-from typing import Dict, Optional, Tuple, List
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import accumulate
+from operator import neg
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 from .types import Order, OrderType, Fill, Side
-from .config import FILL_RULES
+from .config import DEFAULT_CONFIG, Config
+
+if TYPE_CHECKING:
+    from .journal import JournalWriter
 
 
 class ExecutionEngine:
-    def __init__(self):
+    def __init__(
+        self,
+        fill_rules: Optional[Mapping] = None,
+        journal: Optional[JournalWriter] = None,
+        config: Config = DEFAULT_CONFIG,
+    ):
         self.open_orders: Dict[str, Order] = {}
         # Track OCO order groups for continuous monitoring
         self.open_oco_groups: Dict[str, Tuple[Order, Order]] = {}
+        if fill_rules is not None:
+            config = config.with_overrides({"fill_rules": fill_rules})
+        self.config = config
+        self.fill_rules = config.fill_rules
+        self._participation = config.fill_rules["volume_participation"]
+        self._slippage = config.slippage_fraction
+        self.journal = journal
+        # Time of the last market snapshot seen, used to stamp journal cancels
+        self.clock = 0
 
     def place_order(self, order: Order) -> None:
         key = f"{order.symbol}:{id(order)}"
         self.open_orders[key] = order
 
     def cancel_oco_group(self, oco_group: str) -> None:
+        if self.journal and oco_group in self.open_oco_groups:
+            self.journal.cancel(self.clock, oco_group)
         self.open_orders = {k: o for k, o in self.open_orders.items() if o.oco_group != oco_group}
         if oco_group in self.open_oco_groups:
             del self.open_oco_groups[oco_group]
@@ -23,24 +46,36 @@ class ExecutionEngine:
         if not stop_order.oco_group or not tp_order.oco_group:
             return
         self.open_oco_groups[stop_order.oco_group] = (stop_order, tp_order)
+        if self.journal:
+            self.journal.order(self.clock, stop_order)
+            self.journal.order(self.clock, tp_order)
         # Also keep individual references if needed elsewhere
         self.place_order(stop_order)
         self.place_order(tp_order)
 
     def simulate_fill(self, order: Order, market: Dict[str, float]) -> Optional[Fill]:
+        fill = self._simulate_fill(order, market)
+        if self.journal:
+            self.journal.order(self.clock, order, market)
+            if fill:
+                self.journal.fill(fill)
+        return fill
+
+    def _simulate_fill(self, order: Order, market: Dict[str, float]) -> Optional[Fill]:
         bid = market["bid"]
         ask = market["ask"]
         volume = market["volume"]
         spread = ask - bid
         t = int(market.get("time", 0))
+        self.clock = t
 
         if order.order_type == OrderType.LIMIT:
             ref_price = order.price if order.price is not None else (ask if order.side == Side.BUY else bid)
-            available = int(volume * FILL_RULES["volume_participation"])
+            available = int(volume * self._participation)
             filled = min(order.quantity, available)
             if filled <= 0:
                 return None
-            slip = (FILL_RULES["slippage_bps"] / 10000) * ref_price
+            slip = self._slippage * ref_price
             if order.side == Side.BUY:
                 # Buy limit: price should not exceed ask
                 trade_price = min(ref_price, ask) + slip
@@ -51,7 +86,7 @@ class ExecutionEngine:
 
         if order.order_type == OrderType.MARKET:
             ref = ask if order.side == Side.BUY else bid
-            fill_price = ref * (1 + FILL_RULES["slippage_bps"] / 10000)
+            fill_price = ref * (1 + self._slippage)
             return Fill(order, order.quantity, float(fill_price), t)
 
         return None
@@ -75,10 +110,17 @@ class ExecutionEngine:
                 return None, tp_fill
         return None, None
 
-    def check_open_orders(self, market_by_symbol: Dict[str, Dict[str, float]]) -> List[Fill]:
+    def check_open_orders(
+        self,
+        market_by_symbol: Dict[str, Dict[str, float]],
+        groups: Optional[Iterable[str]] = None,
+    ) -> List[Fill]:
+        # `groups` limits the check to those OCO groups, e.g. the ones a solver says are due
         fills: List[Fill] = []
         # Copy keys to avoid mutation during iteration
-        for group_id in list(self.open_oco_groups.keys()):
+        for group_id in list(self.open_oco_groups.keys() if groups is None else groups):
+            if group_id not in self.open_oco_groups:
+                continue
             stop_order, tp_order = self.open_oco_groups[group_id]
             symbol = stop_order.symbol
             market = market_by_symbol.get(symbol)
@@ -99,3 +141,73 @@ class ExecutionEngine:
                     self.cancel_oco_group(group_id)
                     continue
         return fills
+
+
+STOP = "stop"
+TARGET = "target"
+CLOSE_OUT = "close_out"
+
+
+@dataclass(frozen=True)
+class BracketExit:
+    index: int
+    reason: str
+
+
+def _first_at_or_below(prices: Sequence[float], level: float) -> Optional[int]:
+    # The running max of negated prices is sorted, so the first crossing is a bisect
+    running = list(accumulate(map(neg, prices), max))
+    i = bisect_left(running, -level)
+    return i if i < len(running) else None
+
+
+def _first_at_or_above(prices: Sequence[float], level: float) -> Optional[int]:
+    running = list(accumulate(prices, max))
+    i = bisect_left(running, level)
+    return i if i < len(running) else None
+
+
+def solve_bracket_exit(
+    last: Sequence[float],
+    volume: Sequence[float],
+    stop: Optional[float],
+    target: Optional[float],
+    start: int = 0,
+    end: Optional[int] = None,
+    close_out: Optional[int] = None,
+    participation: Optional[float] = DEFAULT_CONFIG.fill_rules["volume_participation"],
+) -> Optional[BracketExit]:
+    # First bar in [start, end) at which check_open_orders would close the bracket: `last`
+    # at or below the stop, or at or above the target, on a bar whose volume allows a limit
+    # fill. The stop wins when both trigger on one bar, and either wins over a `close_out`
+    # on the same bar. With `participation=None` volume is ignored and the first trigger is
+    # returned. A `close_out` before `start` is already due and closes at `start`. Windows
+    # double in size so early exits only read a few bars.
+    end = len(last) if end is None else min(end, len(last))
+    if close_out is not None:
+        close_out = max(close_out, start)
+        end = min(end, close_out + 1)
+    inf = float("inf")
+    lo = start
+    window = 64
+    while lo < end:
+        hi = min(end, lo + window)
+        prices = last[lo:hi]
+        vols = volume[lo:hi]
+        if participation is None or min(vols) * participation >= 1:
+            stop_prices = target_prices = prices
+        else:
+            fillable = [int(v * participation) > 0 for v in vols]
+            stop_prices = [p if ok else inf for p, ok in zip(prices, fillable)]
+            target_prices = [p if ok else -inf for p, ok in zip(prices, fillable)]
+        hit_stop = _first_at_or_below(stop_prices, stop) if stop is not None else None
+        hit_target = _first_at_or_above(target_prices, target) if target is not None else None
+        if hit_stop is not None and (hit_target is None or hit_stop <= hit_target):
+            return BracketExit(lo + hit_stop, STOP)
+        if hit_target is not None:
+            return BracketExit(lo + hit_target, TARGET)
+        lo = hi
+        window *= 2
+    if close_out is not None and close_out < end:
+        return BracketExit(close_out, CLOSE_OUT)
+    return None
@@ -0,0 +1,245 @@
+from __future__ import annotations
+import hashlib
+import os
+from array import array
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from .data import BarColumns, map_column_file, write_column_file
+from .scanner import DEFAULT_INDICATOR_PARAMS, IndicatorParams
+from .types import Bar, SignalContext
+
+# Column order on disk; every column is aligned with the input bars and NaN until defined
+COLUMNS = ("ema_fast", "ema_slow", "rsi", "atr", "bb_lower", "bb_upper", "bb_width", "rvol")
+_NAN = float("nan")
+
+
+def params_key(params: IndicatorParams) -> str:
+    return hashlib.sha256(repr(sorted(asdict(params).items())).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class IndicatorArrays:
+    # Full-series indicator values for one symbol. Index i holds exactly what
+    # build_signal_context computes from the first i + 1 bars.
+    symbol: str
+    params: IndicatorParams
+    time: Sequence[int]
+    close: Sequence[float]
+    columns: Dict[str, Sequence[float]]
+    # Rows dropped before index 0 by a rolling window
+    offset: int = 0
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def index_of(self, time: int) -> Optional[int]:
+        i = bisect_left(self.time, time)
+        return i if i < len(self.time) and self.time[i] == time else None
+
+    def context_at(self, i: int) -> Optional[SignalContext]:
+        if self.offset + i + 1 < self.params.ema_slow:
+            return None
+        c = self.columns
+        price = self.close[i]
+        rsi = c["rsi"][i]
+        atr = c["atr"][i]
+        bb_u = c["bb_upper"][i]
+        bb_l = c["bb_lower"][i]
+        rvol = c["rvol"][i]
+        if bb_l != bb_l:
+            bb_u = bb_l = price
+        return SignalContext(
+            rvol=rvol if rvol == rvol else 0.0,
+            atr_percent=((atr if atr == atr else 0.0) / price) * 100 if price != 0 else 0.0,
+            rsi=rsi if rsi == rsi else 50.0,
+            price=price,
+            bb_upper=bb_u,
+            bb_lower=bb_l,
+            bb_width=(bb_u - bb_l) / bb_l * 100 if bb_l != 0 else 0.0,
+            ema50=c["ema_fast"][i],
+            ema200=c["ema_slow"][i],
+        )
+
+    def bb_width_is_low(self, i: int, lookback: int = 20) -> bool:
+        # Same test as the backtester's 20-day Bollinger squeeze, read off the stored widths
+        first = i - lookback + 1
+        if first < 0 or self.offset + first < self.params.bb_period - 1:
+            return False
+        widths = self.columns["bb_width"]
+        return widths[i] <= min(widths[first:i + 1])
+
+
+def _extend(cols: BarColumns, params: IndicatorParams, out: Dict[str, array], state: dict) -> None:
+    # Appends values for bars[len(out)...] using the recursive state left by earlier bars.
+    # Arithmetic mirrors indicators.py operation for operation so results are bit-identical.
+    closes, highs, lows, vols = cols.close, cols.high, cols.low, cols.volume
+    start = len(out["ema_fast"])
+    k_fast = 2 / (params.ema_fast + 1)
+    k_slow = 2 / (params.ema_slow + 1)
+    rp, ap, bp, lb = params.rsi_period, params.atr_period, params.bb_period, params.rvol_lookback
+    alpha = 1 / ap
+    ema_fast = out["ema_fast"][-1] if start else closes[0]
+    ema_slow = out["ema_slow"][-1] if start else closes[0]
+    avg_gain, avg_loss = state.get("avg_gain"), state.get("avg_loss")
+    atr = out["atr"][-1] if start else _NAN
+
+    for i in range(start, len(cols)):
+        v = closes[i]
+        ema_fast = (v * k_fast) + (ema_fast * (1 - k_fast))
+        ema_slow = (v * k_slow) + (ema_slow * (1 - k_slow))
+        out["ema_fast"].append(ema_fast)
+        out["ema_slow"].append(ema_slow)
+
+        rsi = _NAN
+        if i == rp:
+            gains = [max(closes[j] - closes[j - 1], 0) for j in range(1, rp + 1)]
+            losses = [abs(min(closes[j] - closes[j - 1], 0)) for j in range(1, rp + 1)]
+            avg_gain = sum(gains) / rp
+            avg_loss = sum(losses) / rp
+        elif i > rp:
+            change = v - closes[i - 1]
+            avg_gain = (avg_gain * (rp - 1) + max(change, 0)) / rp
+            avg_loss = (avg_loss * (rp - 1) + abs(min(change, 0))) / rp
+            rsi = 100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+        out["rsi"].append(rsi)
+
+        if i == ap:
+            trs = [
+                max(highs[j] - lows[j], abs(highs[j] - closes[j - 1]), abs(lows[j] - closes[j - 1]))
+                for j in range(1, ap + 1)
+            ]
+            atr = sum(trs) / ap
+        elif i > ap:
+            tr = max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
+            atr = atr * (1 - alpha) + tr * alpha
+        out["atr"].append(atr)
+
+        upper = lower = width = _NAN
+        if i >= bp - 1:
+            window = closes[i - bp + 1:i + 1]
+            m = sum(window) / bp
+            sd = (sum((x - m) ** 2 for x in window) / bp) ** 0.5
+            upper = m + params.bb_std * sd
+            lower = m - params.bb_std * sd
+            width = 0.0 if lower == 0 else (upper - lower) / lower * 100
+        out["bb_upper"].append(upper)
+        out["bb_lower"].append(lower)
+        out["bb_width"].append(width)
+
+        rvol = _NAN
+        if i >= lb:
+            avg = sum(vols[i - lb:i]) / lb
+            rvol = vols[i] / avg if avg > 0 else 0.0
+        out["rvol"].append(rvol)
+
+    state["avg_gain"], state["avg_loss"] = avg_gain, avg_loss
+
+
+def compute_indicator_arrays(cols: BarColumns, params: IndicatorParams = DEFAULT_INDICATOR_PARAMS) -> IndicatorArrays:
+    out = {name: array("d") for name in COLUMNS}
+    if len(cols):
+        _extend(cols, params, out, {})
+    return IndicatorArrays(cols.symbol, params, cols.time, cols.close, out)
+
+
+class RollingIndicators:
+    # Warm, incrementally updated indicators for a live feed. Each appended bar costs one
+    # step of every recursion; only the last `keep` rows of bars and values are retained.
+    def __init__(self, symbol: str, params: IndicatorParams = DEFAULT_INDICATOR_PARAMS, keep: int = 256):
+        # Enough rows for every window plus the 20 band widths of the squeeze test
+        self.keep = max(
+            keep,
+            params.bb_period + 20,
+            params.rvol_lookback + 1,
+            params.rsi_period + 2,
+            params.atr_period + 2,
+        )
+        self.params = params
+        self.bars = BarColumns(symbol=symbol)
+        self.count = 0
+        self._out = {name: array("d") for name in COLUMNS}
+        self._state: dict = {}
+
+    def append(self, bar: Bar) -> None:
+        self.bars.append(bar)
+        self.count += 1
+        _extend(self.bars, self.params, self._out, self._state)
+        if len(self.bars) >= 2 * self.keep:
+            # Recursions only look back one row and windows stay within `keep`, so
+            # trimming both sides keeps later values identical
+            bars = self.bars
+            for col in (bars.time, bars.open, bars.high, bars.low, bars.close, bars.volume):
+                del col[:-self.keep]
+            for col in self._out.values():
+                del col[:-self.keep]
+
+    @property
+    def arrays(self) -> IndicatorArrays:
+        return IndicatorArrays(
+            self.bars.symbol, self.params, self.bars.time, self.bars.close, self._out, self.count - len(self.bars)
+        )
+
+    def context(self) -> Optional[SignalContext]:
+        return self.arrays.context_at(len(self.bars) - 1) if len(self.bars) else None
+
+    def breakout_inputs(self) -> Tuple[bool, bool]:
+        n = len(self.bars)
+        if n < 2:
+            return False, False
+        return self.arrays.bb_width_is_low(n - 1), self.bars.volume[-1] > self.bars.volume[-2]
+
+
+class IndicatorStore:
+    # Indicator arrays persisted beside the bar files of a BarStore root, one file per
+    # dataset name and parameter set. A file is reused when the content hash of the bars
+    # matches; when the stored bars are a prefix of the new ones only the tail is computed.
+    def __init__(self, root: str):
+        self.root = root
+        self.hits = 0
+        self.extended = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, name: str, params: IndicatorParams) -> str:
+        return os.path.join(self.root, f"{name}.{params_key(params)}.ind")
+
+    def load(
+        self,
+        name: str,
+        cols: BarColumns,
+        params: IndicatorParams = DEFAULT_INDICATOR_PARAMS,
+    ) -> IndicatorArrays:
+        path = self.path(name, params)
+        digest = cols.content_hash()
+        header: Optional[dict] = None
+        stored: Dict[str, Sequence[float]] = {}
+        if os.path.exists(path):
+            header, stored = map_column_file(path)
+            if header.get("hash") == digest:
+                self.hits += 1
+                return IndicatorArrays(cols.symbol, params, cols.time, cols.close, stored)
+
+        out = {name_: array("d") for name_ in COLUMNS}
+        state: dict = {}
+        rows = header["rows"] if header else 0
+        if header and 0 < rows <= len(cols) and cols.content_hash(rows) == header["hash"]:
+            for name_ in COLUMNS:
+                out[name_].frombytes(stored[name_].tobytes())
+            state = header["state"]
+            self.extended += 1
+        else:
+            self.misses += 1
+        stored = {}
+        _extend(cols, params, out, state)
+        write_column_file(
+            path,
+            {"symbol": cols.symbol, "rows": len(cols), "hash": digest, "params": asdict(params), "state": state},
+            out,
+        )
+        _, mapped = map_column_file(path)
+        return IndicatorArrays(cols.symbol, params, cols.time, cols.close, mapped)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "extended": self.extended, "misses": self.misses}
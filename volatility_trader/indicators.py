@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import List, Tuple
+from itertools import accumulate, repeat
+from operator import sub, truediv
+from typing import Dict, List, Sequence, Tuple
 
 
 def ema(values: List[float], period: int) -> List[float]:
@@ -82,3 +84,154 @@ def rvol(volumes: List[float], lookback_days: int = 20) -> List[float]:
         avg = sum(volumes[i - lookback_days:i]) / lookback_days
         result.append(volumes[i] / avg if avg > 0 else 0.0)
     return result
+
+
+# Banks compute one indicator for many parameter settings over the same series. Row k of
+# a bank is the series the single-parameter function returns for setting k. Window
+# indicators use shared running sums instead of re-summing every window, so their values
+# match the single functions to rounding (about 1e-10 relative) rather than bit for bit.
+
+# Windows per restart of the Bollinger running sums, and the variance, relative to the mean
+# square of centred values, below which a window's variance is recomputed directly
+_BB_BLOCK = 512
+_BB_FLAT = 1e-6
+
+
+def _prefix_sums(values: Sequence[float]) -> List[float]:
+    return list(accumulate(values, initial=0.0))
+
+
+def ema_bank(values: Sequence[float], periods: Sequence[int]) -> List[List[float]]:
+    rows: List[List[float]] = []
+    for period in periods:
+        if period <= 0 or not values:
+            rows.append([])
+            continue
+        k = 2 / (period + 1)
+        rows.append(list(accumulate(values, lambda e, v: (v * k) + (e * (1 - k)), initial=values[0]))[1:])
+    return rows
+
+
+def rsi_bank(values: Sequence[float], periods: Sequence[int]) -> List[List[float]]:
+    # Gains and losses are derived once and shared by every period
+    changes = [b - a for a, b in zip(values, values[1:])]
+    gains = [max(c, 0) for c in changes]
+    losses = [abs(min(c, 0)) for c in changes]
+    rows: List[List[float]] = []
+    for period in periods:
+        if len(values) < period + 1:
+            rows.append([])
+            continue
+        avg_gain = sum(gains[:period]) / period
+        avg_loss = sum(losses[:period]) / period
+        row: List[float] = []
+        for gain, loss in zip(gains[period:], losses[period:]):
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+            row.append(100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss)))
+        rows.append(row)
+    return rows
+
+
+def atr_bank(
+    highs: Sequence[float],
+    lows: Sequence[float],
+    closes: Sequence[float],
+    periods: Sequence[int],
+) -> List[List[float]]:
+    # True range is computed once and shared by every period
+    if len(highs) != len(lows) or len(lows) != len(closes):
+        return [[] for _ in periods]
+    trs = [
+        max(h - l, abs(h - prev), abs(l - prev))
+        for h, l, prev in zip(highs[1:], lows[1:], closes)
+    ]
+    rows: List[List[float]] = []
+    for period in periods:
+        if len(highs) < period + 1:
+            rows.append([])
+            continue
+        alpha = 1 / period
+        first = sum(trs[:period]) / period
+        rows.append(list(accumulate(trs[period:], lambda a, tr: a * (1 - alpha) + tr * alpha, initial=first)))
+    return rows
+
+
+def bollinger_bank(
+    values: Sequence[float],
+    settings: Sequence[Tuple[int, float]],
+) -> Tuple[List[List[float]], List[List[float]], List[List[float]]]:
+    # Window moments are rolled forward by the value entering minus the value leaving,
+    # computed once per period and shared by every num_std. Values are re-centred on the
+    # local mean every _BB_BLOCK windows, where the rolling sums also restart, so precision
+    # does not decay as prices drift. A window holding the same values as the one before
+    # gets exactly the same band. Windows too flat for the sums to resolve their variance
+    # are recomputed directly.
+    n = len(values)
+    periods = sorted({period for period, _ in settings if 0 < period <= n})
+    stats: Dict[int, Tuple[List[float], List[float]]] = {period: ([], []) for period in periods}
+    if periods:
+        longest = periods[-1]
+        for block in range(periods[0], n + 1, _BB_BLOCK):
+            # Window ends in [block, stop) read values[lo:stop - 1]
+            stop = min(block + _BB_BLOCK, n + 1)
+            lo = max(0, block - longest)
+            segment = values[lo:stop - 1]
+            shift = sum(segment) / len(segment)
+            centred = [v - shift for v in segment]
+            squares = [c * c for c in centred]
+            for period in periods:
+                first = max(block, period) - period - lo
+                last = stop - period - lo
+                if first >= last:
+                    continue
+                ma, sds = stats[period]
+                sums = accumulate(
+                    map(sub, centred[first + period:last - 1 + period], centred[first:last - 1]),
+                    initial=sum(centred[first:first + period]),
+                )
+                sq_sums = accumulate(
+                    map(sub, squares[first + period:last - 1 + period], squares[first:last - 1]),
+                    initial=sum(squares[first:first + period]),
+                )
+                for i, s, q in zip(range(first, last), sums, sq_sums):
+                    m = s / period
+                    mean_sq = q / period
+                    var = mean_sq - m * m
+                    if var <= _BB_FLAT * mean_sq:
+                        window = segment[i:i + period]
+                        m = sum(window) / period
+                        ma.append(m)
+                        sds.append((sum((x - m) ** 2 for x in window) / period) ** 0.5)
+                    else:
+                        ma.append(m + shift)
+                        sds.append(var ** 0.5)
+    lower_rows: List[List[float]] = []
+    ma_rows: List[List[float]] = []
+    upper_rows: List[List[float]] = []
+    for period, num_std in settings:
+        if period not in stats:
+            lower_rows.append([])
+            ma_rows.append([])
+            upper_rows.append([])
+            continue
+        ma, sds = stats[period]
+        ma_rows.append(ma)
+        upper_rows.append([m + num_std * sd for m, sd in zip(ma, sds)])
+        lower_rows.append([m - num_std * sd for m, sd in zip(ma, sds)])
+    return lower_rows, ma_rows, upper_rows
+
+
+def rvol_bank(volumes: Sequence[float], lookbacks: Sequence[int]) -> List[List[float]]:
+    sums = _prefix_sums(volumes)
+    rows: List[List[float]] = []
+    for lookback in lookbacks:
+        if len(volumes) < lookback + 1:
+            rows.append([])
+            continue
+        avgs = list(map(truediv, map(sub, sums[lookback:-1], sums[:-lookback - 1]), repeat(lookback)))
+        if min(avgs) > 0:
+            rows.append(list(map(truediv, volumes[lookback:], avgs)))
+        else:
+            rows.append([v / avg if avg > 0 else 0.0 for v, avg in zip(volumes[lookback:], avgs)])
+    return rows
@@ -0,0 +1,264 @@
+from __future__ import annotations
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .types import Decision, Fill, Order, OrderType, Side
+from .metrics import Trade, Daily, compute_metrics, Metrics
+
+MAGIC = b"VTJRNL1\n"
+
+# Record kinds
+STRING = 0
+DECISION = 1
+ORDER = 2
+FILL = 3
+CANCEL = 4
+EQUITY = 5
+DAY = 6
+CLOSE = 7
+RUN = 8
+
+_HEADER = struct.Struct("<Bq")  # kind, time
+_PAYLOADS = {
+    STRING: struct.Struct("<IH"),  # string id, byte length (bytes follow)
+    DECISION: struct.Struct("<IIIBd"),  # symbol, reason, signal type, should_enter, price
+    ORDER: struct.Struct("<IBBqdddddIB"),  # symbol, side, type, qty, price, bid, ask, last, volume, oco, resting
+    FILL: struct.Struct("<qd"),  # filled qty, price (fills the preceding ORDER)
+    CANCEL: struct.Struct("<I"),  # oco group
+    EQUITY: struct.Struct("<ddd"),  # equity, cash, daily pnl
+    DAY: struct.Struct("<d"),  # daily pnl
+    CLOSE: struct.Struct("<III"),  # symbol, bars held, bars in drawdown
+    RUN: struct.Struct("<I"),  # run number within the file, starting at 1
+}
+_NAN = float("nan")
+_SIDES = {Side.BUY: 0, Side.SELL: 1}
+_TYPES = {OrderType.MARKET: 0, OrderType.LIMIT: 1}
+
+
+class JournalRecord(NamedTuple):
+    kind: int
+    time: int
+    values: tuple
+
+
+class JournalWriter:
+    # Records are only ever appended. An existing file is replaced unless `append` is set,
+    # in which case this run continues its string table after the earlier runs. Every run
+    # starts with a RUN record so replay can tell runs apart.
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self._strings: Dict[str, int] = {}
+        run = 1
+        exists = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            for rec in read_journal(path):
+                if rec.kind == STRING:
+                    self._strings[rec.values[1]] = rec.values[0]
+                elif rec.kind == RUN:
+                    run = rec.values[0] + 1
+        self._fh: BinaryIO = open(path, "ab" if exists else "wb")
+        if not exists:
+            self._fh.write(MAGIC)
+        self._write(RUN, 0, run)
+
+    def _intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        sid = self._strings.get(value)
+        if sid is None:
+            sid = len(self._strings) + 1
+            self._strings[value] = sid
+            data = value.encode("utf-8")
+            self._fh.write(_HEADER.pack(STRING, 0))
+            self._fh.write(_PAYLOADS[STRING].pack(sid, len(data)))
+            self._fh.write(data)
+        return sid
+
+    def _write(self, kind: int, time: int, *values) -> None:
+        self._fh.write(_HEADER.pack(kind, time))
+        self._fh.write(_PAYLOADS[kind].pack(*values))
+
+    def decision(self, time: int, symbol: str, decision: Decision) -> None:
+        self._write(
+            DECISION,
+            time,
+            self._intern(symbol),
+            self._intern(decision.reason),
+            self._intern(decision.signal_type),
+            int(decision.should_enter),
+            decision.entry_price if decision.entry_price is not None else _NAN,
+        )
+
+    def order(self, time: int, order: Order, market: Optional[Dict[str, float]] = None) -> None:
+        # Without a market snapshot the order is resting (e.g. an OCO leg being registered)
+        m = market or {}
+        self._write(
+            ORDER,
+            time,
+            self._intern(order.symbol),
+            _SIDES[order.side],
+            _TYPES[order.order_type],
+            order.quantity,
+            order.price if order.price is not None else _NAN,
+            m.get("bid", _NAN),
+            m.get("ask", _NAN),
+            m.get("last", _NAN),
+            m.get("volume", _NAN),
+            self._intern(order.oco_group),
+            int(market is None),
+        )
+
+    def fill(self, fill: Fill) -> None:
+        self._write(FILL, fill.time, fill.filled_qty, fill.price)
+
+    def cancel(self, time: int, oco_group: str) -> None:
+        self._write(CANCEL, time, self._intern(oco_group))
+
+    def equity(self, time: int, equity: float, cash: float, daily_pnl: float) -> None:
+        self._write(EQUITY, time, equity, cash, daily_pnl)
+
+    def day(self, time: int, daily_pnl: float) -> None:
+        self._write(DAY, time, daily_pnl)
+
+    def close_position(self, time: int, symbol: str, bars_held: int, time_in_drawdown_bars: int) -> None:
+        self._write(CLOSE, time, self._intern(symbol), bars_held, time_in_drawdown_bars)
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self) -> "JournalWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_journal(path: str) -> Iterator[JournalRecord]:
+    with open(path, "rb") as fh:
+        data = fh.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"Not a journal file: {path}")
+    pos = len(MAGIC)
+    header = _HEADER
+    payloads = _PAYLOADS
+    string_payload = payloads[STRING]
+    while pos < len(data):
+        kind, time = header.unpack_from(data, pos)
+        pos += header.size
+        if kind == STRING:
+            sid, length = string_payload.unpack_from(data, pos)
+            pos += string_payload.size
+            yield JournalRecord(kind, time, (sid, data[pos:pos + length].decode("utf-8")))
+            pos += length
+            continue
+        payload = payloads[kind]
+        yield JournalRecord(kind, time, payload.unpack_from(data, pos))
+        pos += payload.size
+
+
+@dataclass
+class ReplayResult:
+    trades: List[Trade]
+    dailies: List[Daily]
+    metrics: Metrics
+    fills: int = 0
+    # Recorded fills that would not have filled under the replay's fill rules
+    unfilled: int = 0
+    decisions: int = 0
+    equity_marks: List[Tuple[int, float]] = field(default_factory=list)
+
+
+def replay(path: str, fill_rules: Optional[dict] = None, keep_equity: bool = False) -> ReplayResult:
+    # Rebuilds positions, trades and dailies of the last run in the journal alone. With
+    # `fill_rules`, every recorded fill is re-priced and re-sized against its recorded market
+    # snapshot; the decision path itself is the recorded one. As in the backtester, an exit
+    # fill closes the whole position.
+    from .execution import ExecutionEngine
+
+    engine = ExecutionEngine(fill_rules=fill_rules) if fill_rules is not None else None
+    strings: Dict[int, str] = {0: ""}
+    sides = {v: k for k, v in _SIDES.items()}
+    types = {v: k for k, v in _TYPES.items()}
+    positions: Dict[str, Tuple[int, float, int]] = {}
+    exits: Dict[str, Tuple[float, int]] = {}
+    trades: List[Trade] = []
+    dailies: List[Daily] = []
+    result = ReplayResult(trades=trades, dailies=dailies, metrics=compute_metrics([], [], []))
+    day_pnl = 0.0
+    last_order: Optional[Tuple[Order, Dict[str, float]]] = None
+
+    for kind, time, values in read_journal(path):
+        if kind == STRING:
+            strings[values[0]] = values[1]
+        elif kind == RUN:
+            # Only the last run is replayed; strings carry over between runs
+            positions.clear()
+            exits.clear()
+            trades = []
+            dailies = []
+            result = ReplayResult(trades=trades, dailies=dailies, metrics=result.metrics)
+            day_pnl = 0.0
+            last_order = None
+        elif kind == ORDER:
+            symbol, side, otype, qty, price, bid, ask, last, volume, oco, resting = values
+            order = Order(
+                symbol=strings[symbol],
+                side=sides[side],
+                quantity=qty,
+                order_type=types[otype],
+                price=None if price != price else price,
+                oco_group=strings[oco] or None,
+            )
+            market = {"bid": bid, "ask": ask, "last": last, "volume": volume, "time": time}
+            last_order = None if resting else (order, market)
+        elif kind == FILL:
+            if last_order is None:
+                continue
+            order, market = last_order
+            qty, price = values
+            result.fills += 1
+            if engine is not None:
+                refill = engine.simulate_fill(order, market)
+                if refill is None:
+                    result.unfilled += 1
+                else:
+                    qty, price = refill.filled_qty, refill.price
+            if order.side == Side.BUY:
+                positions[order.symbol] = (qty, price, time)
+            else:
+                exits[order.symbol] = (price, time)
+            last_order = None
+        elif kind == CLOSE:
+            symbol = strings[values[0]]
+            entry = positions.pop(symbol, None)
+            exit_ = exits.pop(symbol, None)
+            if entry is None or exit_ is None:
+                continue
+            qty, entry_price, entry_time = entry
+            exit_price, exit_time = exit_
+            pnl = (exit_price - entry_price) * qty
+            trades.append(Trade(
+                pnl=pnl,
+                adhered_to_plan=True,
+                entry_time=entry_time,
+                exit_time=exit_time,
+                duration_bars=values[1],
+                time_in_drawdown_bars=values[2],
+                symbol=symbol,
+            ))
+            day_pnl += pnl
+        elif kind == DAY:
+            dailies.append(Daily(pnl=day_pnl if engine is not None else values[0], time=time))
+            day_pnl = 0.0
+        elif kind == DECISION:
+            result.decisions += 1
+        elif kind == EQUITY and keep_equity:
+            result.equity_marks.append((time, values[0]))
+
+    result.metrics = compute_metrics(trades, dailies, [])
+    return result
@@ -1,7 +1,10 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from bisect import bisect_right
+from itertools import accumulate
 from math import sqrt
-from typing import List
+from operator import mul, sub, truediv
+from typing import List, Optional, Sequence
 
 
 @dataclass
@@ -12,11 +15,46 @@ class Trade:
     exit_time: int | None = None
     duration_bars: int = 0
     time_in_drawdown_bars: int = 0
+    symbol: str | None = None
 
 
 @dataclass
 class Daily:
     pnl: float
+    time: int | None = None  # last bar time of the day
+
+
+@dataclass
+class TradeTotals:
+    # Running sums behind every trade metric, so runs that stream trades out instead of
+    # keeping them can still be summarized
+    count: int = 0
+    wins: int = 0
+    losses: int = 0
+    gross_win: float = 0.0
+    gross_loss: float = 0.0
+    adhered: int = 0
+    duration_bars: int = 0
+    time_in_drawdown_bars: int = 0
+
+    def add(self, trade: Trade) -> None:
+        self.count += 1
+        if trade.pnl > 0:
+            self.wins += 1
+            self.gross_win += trade.pnl
+        elif trade.pnl < 0:
+            self.losses += 1
+            self.gross_loss += -trade.pnl
+        self.adhered += 1 if trade.adhered_to_plan else 0
+        self.duration_bars += trade.duration_bars
+        self.time_in_drawdown_bars += trade.time_in_drawdown_bars
+
+    @classmethod
+    def of(cls, trades: Sequence[Trade]) -> "TradeTotals":
+        totals = cls()
+        for trade in trades:
+            totals.add(trade)
+        return totals
 
 
 @dataclass
@@ -33,49 +71,69 @@ class Metrics:
     avg_time_in_drawdown_bars: float
 
 
-def compute_metrics(trades: List[Trade], dailies: List[Daily], slippage_bps_samples: List[float]) -> Metrics:
-    wins = [t.pnl for t in trades if t.pnl > 0]
-    losses = [-t.pnl for t in trades if t.pnl < 0]
+def profit_factor(pnls: Sequence[float]) -> float:
+    return _profit_factor(sum(p for p in pnls if p > 0), -sum(p for p in pnls if p < 0))
 
-    win_rate = (len(wins) / len(trades)) if trades else 0.0
-    profit_factor = (sum(wins) / sum(losses)) if losses else (float("inf") if wins else 0.0)
-    avg_win = (sum(wins) / len(wins)) if wins else 0.0
-    avg_loss = (sum(losses) / len(losses)) if losses else 0.0
-    avg_win_loss_ratio = (avg_win / avg_loss) if avg_loss > 0 else (float("inf") if avg_win > 0 else 0.0)
 
-    equity = 0.0
-    peak = 0.0
-    max_dd = 0.0
-    for d in dailies:
-        equity += d.pnl
-        peak = max(peak, equity)
-        if peak > 0:
-            dd = (equity - peak) / peak
-            max_dd = min(max_dd, dd)
-    max_drawdown = abs(max_dd)
+def _profit_factor(gross_win: float, gross_loss: float) -> float:
+    if gross_loss > 0:
+        return gross_win / gross_loss
+    return float("inf") if gross_win > 0 else 0.0
+
+
+def max_drawdown(daily_pnls: Sequence[float]) -> float:
+    # Drawdown of cumulative PnL relative to its running peak
+    equity = list(accumulate(daily_pnls))
+    peaks = list(accumulate(equity, max, initial=0.0))[1:]
+    # Peaks never decrease, so the days without a positive peak form a prefix
+    k = bisect_right(peaks, 0.0)
+    equity, peaks = equity[k:], peaks[k:]
+    worst = min(map(truediv, map(sub, equity, peaks), peaks), default=0.0)
+    return abs(min(worst, 0.0))
+
+
+def sharpe_ratio(daily_returns: Sequence[float]) -> float:
+    n = len(daily_returns)
+    if n <= 1:
+        return 0.0
+    mean = sum(daily_returns) / n
+    dev = [x - mean for x in daily_returns]
+    var = sum(map(mul, dev, dev)) / (n - 1)
+    std = sqrt(var) if var > 0 else 0.0
+    return (mean / std) * sqrt(252) if std > 0 else 0.0
+
+
+def compute_metrics(
+    trades: List[Trade],
+    dailies: List[Daily],
+    slippage_bps_samples: List[float],
+    totals: Optional[TradeTotals] = None,
+) -> Metrics:
+    # Trade metrics come from `totals` when given, else from `trades`
+    if totals is None:
+        totals = TradeTotals.of(trades)
+    count = totals.count
+
+    win_rate = (totals.wins / count) if count else 0.0
+    avg_win = (totals.gross_win / totals.wins) if totals.wins else 0.0
+    avg_loss = (totals.gross_loss / totals.losses) if totals.losses else 0.0
+    avg_win_loss_ratio = (avg_win / avg_loss) if avg_loss > 0 else (float("inf") if avg_win > 0 else 0.0)
 
     daily_returns = [d.pnl for d in dailies]
-    if len(daily_returns) > 1:
-        mean = sum(daily_returns) / len(daily_returns)
-        var = sum((x - mean) ** 2 for x in daily_returns) / (len(daily_returns) - 1)
-        std = sqrt(var) if var > 0 else 0.0
-        sharpe = (mean / std) * sqrt(252) if std > 0 else 0.0
-    else:
-        sharpe = 0.0
-
-    orders_per_day = (len(trades) / len(dailies)) if dailies else 0.0
-    plan_adherence = (sum(1 for t in trades if t.adhered_to_plan) / len(trades)) if trades else 0.0
+
+    orders_per_day = (count / len(dailies)) if dailies else 0.0
+    plan_adherence = (totals.adhered / count) if count else 0.0
     slippage_impact_bps = sum(slippage_bps_samples) / len(slippage_bps_samples) if slippage_bps_samples else 0.0
 
-    avg_duration = sum(t.duration_bars for t in trades) / len(trades) if trades else 0.0
-    avg_time_in_dd = sum(t.time_in_drawdown_bars for t in trades) / len(trades) if trades else 0.0
+    avg_duration = totals.duration_bars / count if count else 0.0
+    avg_time_in_dd = totals.time_in_drawdown_bars / count if count else 0.0
 
     return Metrics(
         win_rate=win_rate,
-        profit_factor=profit_factor,
+        profit_factor=_profit_factor(totals.gross_win, totals.gross_loss),
         avg_win_loss_ratio=avg_win_loss_ratio,
-        max_drawdown=max_drawdown,
-        sharpe_ratio=sharpe,
+        max_drawdown=max_drawdown(daily_returns),
+        sharpe_ratio=sharpe_ratio(daily_returns),
         orders_per_day=orders_per_day,
         plan_adherence=plan_adherence,
         slippage_impact_bps=slippage_impact_bps,
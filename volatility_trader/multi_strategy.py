@@ -0,0 +1,78 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .backtest import BacktestResult, IndicatorData, MarketData, StrategyBacktester, iter_market_steps
+from .scanner import DEFAULT_INDICATOR_PARAMS, IndicatorParams, SignalContextCache
+from .sinks import ResultSink
+from .journal import JournalWriter
+from .config import DEFAULT_CONFIG, Config
+
+
+@dataclass
+class StrategyVariant:
+    name: str
+    strategy_rules: dict = field(default_factory=dict)
+    account_equity: float = 100_000
+    respect_schedule: bool = True
+    sink: Optional[ResultSink] = None
+    journal: Optional[JournalWriter] = None
+    # Fill and risk rules for this variant; defaults to the backtester's config
+    config: Optional[Config] = None
+
+
+class MultiStrategyBacktester:
+    # Walks the timeline once: market snapshots and signal contexts are built per bar and
+    # shared, while each variant keeps its own engine, account and positions. Shared
+    # snapshots are quoted with the spread and timezone of `config`.
+    def __init__(
+        self,
+        variants: List[StrategyVariant],
+        context_cache: Optional[SignalContextCache] = None,
+        indicator_params: IndicatorParams = DEFAULT_INDICATOR_PARAMS,
+        config: Config = DEFAULT_CONFIG,
+        context_timeframe: Optional[str] = None,
+    ):
+        names = [v.name for v in variants]
+        if len(set(names)) != len(names):
+            raise ValueError("Strategy variant names must be unique")
+        self.context_cache = context_cache if context_cache is not None else SignalContextCache()
+        self.indicator_params = indicator_params
+        self.config = config
+        self.context_timeframe = context_timeframe
+        self.backtesters: Dict[str, StrategyBacktester] = {
+            v.name: StrategyBacktester(
+                account_equity=v.account_equity,
+                respect_schedule=v.respect_schedule,
+                sink=v.sink,
+                context_cache=self.context_cache,
+                indicator_params=indicator_params,
+                strategy_rules=v.strategy_rules,
+                journal=v.journal,
+                config=v.config if v.config is not None else config,
+            )
+            for v in variants
+        }
+
+    def run(
+        self,
+        symbol_to_bars: MarketData,
+        warmup_bars: Optional[int] = None,
+        indicators: Optional[IndicatorData] = None,
+    ) -> Dict[str, BacktestResult]:
+        steps = iter_market_steps(
+            symbol_to_bars,
+            self.context_cache,
+            self.indicator_params,
+            warmup_bars=warmup_bars,
+            indicators=indicators,
+            config=self.config,
+            context_timeframe=self.context_timeframe,
+        )
+        for step in steps:
+            for bt in self.backtesters.values():
+                bt.step(step)
+        return {name: bt.finish() for name, bt in self.backtesters.items()}
+
+    def summarize(self) -> Dict[str, dict]:
+        return {name: bt.summarize() for name, bt in self.backtesters.items()}
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from math import isfinite
+from typing import List, Optional, Tuple
+
+from .types import Bar
+from .data import BarColumns
+from .resample import UtcOffsetCache
+
+
+@dataclass
+class QualityReport:
+    symbol: str
+    input_rows: int = 0
+    output_rows: int = 0
+    out_of_order: int = 0
+    duplicates: int = 0
+    missing_fields: int = 0
+    invalid_ohlc: int = 0
+    zero_volume: int = 0
+    gaps: int = 0
+    sessions: int = 0
+    expected_interval: int = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.input_rows - self.output_rows
+
+    @property
+    def clean(self) -> bool:
+        return self.dropped == 0 and self.out_of_order == 0 and self.gaps == 0
+
+
+@dataclass
+class NormalizedBars:
+    columns: BarColumns
+    # 1 where the bar opens a new ET session / follows a gap inside a session
+    session_start: array
+    gap_before: array
+    report: QualityReport
+
+
+def normalize_columns(
+    cols: BarColumns,
+    expected_interval: Optional[int] = None,
+    drop_zero_volume: bool = True,
+) -> NormalizedBars:
+    report = QualityReport(symbol=cols.symbol, input_rows=len(cols))
+    n = len(cols)
+    times = cols.time
+
+    # Sort (stable, so later duplicates stay later) only when the feed is out of order
+    report.out_of_order = sum(1 for a, b in zip(times, times[1:]) if b < a)
+    order = sorted(range(n), key=times.__getitem__) if report.out_of_order else range(n)
+
+    # Dedupe on timestamp, keeping the last row received for each time
+    ts = [times[i] for i in order]
+    last_of_run = [k == n - 1 or ts[k] != ts[k + 1] for k in range(n)]
+    report.duplicates = n - sum(last_of_run)
+
+    o = [cols.open[i] for i in order]
+    h = [cols.high[i] for i in order]
+    l = [cols.low[i] for i in order]
+    c = [cols.close[i] for i in order]
+    v = [cols.volume[i] for i in order]
+
+    missing = [
+        not (t > 0 and isfinite(oo) and isfinite(hh) and isfinite(ll) and isfinite(cc) and isfinite(vv))
+        for t, oo, hh, ll, cc, vv in zip(ts, o, h, l, c, v)
+    ]
+    invalid = [
+        not m and (ll <= 0 or hh < ll or hh < max(oo, cc) or ll > min(oo, cc) or vv < 0)
+        for m, oo, hh, ll, cc, vv in zip(missing, o, h, l, c, v)
+    ]
+    zero_volume = [not m and not bad and vv == 0 for m, bad, vv in zip(missing, invalid, v)]
+    keep = [
+        last and not m and not bad and not (drop_zero_volume and z)
+        for last, m, bad, z in zip(last_of_run, missing, invalid, zero_volume)
+    ]
+    report.missing_fields = sum(a and b for a, b in zip(missing, last_of_run))
+    report.invalid_ohlc = sum(a and b for a, b in zip(invalid, last_of_run))
+    report.zero_volume = sum(a and b for a, b in zip(zero_volume, last_of_run))
+
+    idx = [k for k in range(n) if keep[k]]
+    out = BarColumns(
+        symbol=cols.symbol,
+        time=array("q", [ts[k] for k in idx]),
+        open=array("d", [o[k] for k in idx]),
+        high=array("d", [h[k] for k in idx]),
+        low=array("d", [l[k] for k in idx]),
+        close=array("d", [c[k] for k in idx]),
+        volume=array("d", [v[k] for k in idx]),
+    )
+    report.output_rows = len(out)
+
+    # Sessions are ET calendar days; gaps are steps wider than the bar interval within one
+    offsets = UtcOffsetCache()
+    days = [(t + offsets(t)) // 86400 for t in out.time]
+    steps = [b - a for a, b in zip(out.time, out.time[1:])]
+    if expected_interval is None:
+        intraday = sorted(s for s, d0, d1 in zip(steps, days, days[1:]) if d0 == d1) or sorted(steps)
+        expected_interval = intraday[len(intraday) // 2] if intraday else 0
+    report.expected_interval = expected_interval
+    session_start = array("b", [1] * min(1, len(out)))
+    session_start.extend(int(d1 != d0) for d0, d1 in zip(days, days[1:]))
+    gap_before = array("b", [0] * min(1, len(out)))
+    gap_before.extend(
+        int(not new and expected_interval > 0 and s > expected_interval)
+        for s, new in zip(steps, session_start[1:])
+    )
+    report.sessions = sum(session_start)
+    report.gaps = sum(gap_before)
+    return NormalizedBars(columns=out, session_start=session_start, gap_before=gap_before, report=report)
+
+
+def normalize_bars(
+    bars: List[Bar],
+    expected_interval: Optional[int] = None,
+    drop_zero_volume: bool = True,
+) -> Tuple[List[Bar], QualityReport]:
+    symbol = bars[0].symbol if bars else ""
+    result = normalize_columns(BarColumns.from_bars(symbol, bars), expected_interval, drop_zero_volume)
+    return result.columns.to_bars(), result.report
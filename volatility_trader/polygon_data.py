@@ -2,11 +2,19 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
 from urllib.parse import urlencode
 from urllib.request import urlopen
 
 from .types import Bar
+from .data import BarColumns
+
+# Overridable so tests and local mirrors can stand in for the real API
+DEFAULT_BASE_URL = "https://api.polygon.io"
+
+# Missing fields become NaN so normalization flags them instead of trading on zeros
+_MISSING = float("nan")
 
 
 @dataclass(frozen=True)
@@ -28,6 +36,7 @@ def fetch_polygon_bars(
     multiplier: int = 1,
     timespan: str = "minute",
     adjusted: bool = True,
+    base_url: str = DEFAULT_BASE_URL,
 ) -> Dict[str, List[Bar]]:
     if not api_key:
         raise ValueError("Polygon API key is required.")
@@ -41,13 +50,75 @@ def fetch_polygon_bars(
             timespan=timespan,
             adjusted=adjusted,
         )
-        results[symbol] = _fetch_polygon_bars_for_symbol(request, api_key)
+        results[symbol] = _fetch_polygon_bars_for_symbol(request, api_key, base_url)
     return results
 
 
-def _fetch_polygon_bars_for_symbol(request: PolygonRequest, api_key: str) -> List[Bar]:
-    base_url = (
-        f"https://api.polygon.io/v2/aggs/ticker/{request.symbol}/range/"
+def iter_polygon_day_chunks(
+    symbols: Iterable[str],
+    start: str,
+    end: str,
+    api_key: str,
+    multiplier: int = 1,
+    timespan: str = "minute",
+    adjusted: bool = True,
+    base_url: str = DEFAULT_BASE_URL,
+) -> Iterator[Dict[str, List[Bar]]]:
+    # One fetch per calendar day so a long backtest never holds more than a day of bars
+    symbols = list(symbols)
+    day = date.fromisoformat(start)
+    last = date.fromisoformat(end)
+    while day <= last:
+        if day.weekday() < 5:
+            chunk = fetch_polygon_bars(
+                symbols, day.isoformat(), day.isoformat(), api_key, multiplier, timespan, adjusted, base_url
+            )
+            if any(chunk.values()):
+                yield chunk
+        day += timedelta(days=1)
+
+
+def fetch_grouped_daily(
+    start: str,
+    end: str,
+    api_key: str,
+    symbols: Optional[Iterable[str]] = None,
+    adjusted: bool = True,
+    base_url: str = DEFAULT_BASE_URL,
+) -> Dict[str, BarColumns]:
+    # One whole-market request per weekday instead of one request series per symbol.
+    # Rows are pivoted into per-symbol columns; `symbols` keeps only those tickers.
+    if not api_key:
+        raise ValueError("Polygon API key is required.")
+    wanted = set(symbols) if symbols is not None else None
+    columns: Dict[str, BarColumns] = {}
+    params = urlencode({"adjusted": "true" if adjusted else "false", "apiKey": api_key})
+    day = date.fromisoformat(start)
+    last = date.fromisoformat(end)
+    while day <= last:
+        if day.weekday() < 5:
+            payload = _load_json(f"{base_url}/v2/aggs/grouped/locale/us/market/stocks/{day.isoformat()}?{params}")
+            # Holidays come back with no results
+            for row in payload.get("results") or []:
+                symbol = row.get("T")
+                if not symbol or (wanted is not None and symbol not in wanted):
+                    continue
+                cols = columns.get(symbol)
+                if cols is None:
+                    cols = columns[symbol] = BarColumns(symbol=symbol)
+                cols.time.append(int(row.get("t", 0)) // 1000)
+                cols.open.append(float(row.get("o", _MISSING)))
+                cols.high.append(float(row.get("h", _MISSING)))
+                cols.low.append(float(row.get("l", _MISSING)))
+                cols.close.append(float(row.get("c", _MISSING)))
+                cols.volume.append(float(row.get("v", _MISSING)))
+        day += timedelta(days=1)
+    return columns
+
+
+def _fetch_polygon_bars_for_symbol(request: PolygonRequest, api_key: str, base_url: str = DEFAULT_BASE_URL) -> List[Bar]:
+    endpoint = (
+        f"{base_url}/v2/aggs/ticker/{request.symbol}/range/"
         f"{request.multiplier}/{request.timespan}/{request.start}/{request.end}"
     )
     params = {
@@ -56,7 +127,7 @@ def _fetch_polygon_bars_for_symbol(request: PolygonRequest, api_key: str) -> Lis
         "limit": str(request.limit),
         "apiKey": api_key,
     }
-    url = f"{base_url}?{urlencode(params)}"
+    url = f"{endpoint}?{urlencode(params)}"
     bars: List[Bar] = []
     while url:
         payload = _load_json(url)
@@ -66,11 +137,11 @@ def _fetch_polygon_bars_for_symbol(request: PolygonRequest, api_key: str) -> Lis
                 Bar(
                     symbol=request.symbol,
                     time=timestamp_ms // 1000,
-                    open=float(row.get("o", 0)),
-                    high=float(row.get("h", 0)),
-                    low=float(row.get("l", 0)),
-                    close=float(row.get("c", 0)),
-                    volume=float(row.get("v", 0)),
+                    open=float(row.get("o", _MISSING)),
+                    high=float(row.get("h", _MISSING)),
+                    low=float(row.get("l", _MISSING)),
+                    close=float(row.get("c", _MISSING)),
+                    volume=float(row.get("v", _MISSING)),
                 )
             )
         url = _next_url(payload.get("next_url"), api_key)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo
+
+from .types import Bar
+from .data import BarColumns
+from .config import TRADING_SCHEDULE
+
+DAILY = "1d"
+SESSION_OPEN_ET = "09:30"
+
+_ET = ZoneInfo(TRADING_SCHEDULE.get("timezone", "US/Eastern"))
+_SESSION_OPEN_SECONDS = int(SESSION_OPEN_ET[:2]) * 3600 + int(SESSION_OPEN_ET[3:]) * 60
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    tf = timeframe.strip().lower()
+    if tf == DAILY:
+        return 86400
+    if tf.endswith("m") and tf[:-1].isdigit() and int(tf[:-1]) > 0:
+        return int(tf[:-1]) * 60
+    if tf.endswith("h") and tf[:-1].isdigit() and int(tf[:-1]) > 0:
+        return int(tf[:-1]) * 3600
+    raise ValueError(f"Unknown timeframe: {timeframe}")
+
+
+class UtcOffsetCache:
+    # DST transitions happen on the hour, so the ET offset is constant within a UTC hour
+    def __init__(self, tz: ZoneInfo = _ET):
+        self.tz = tz
+        self._by_hour: Dict[int, int] = {}
+
+    def __call__(self, t: int) -> int:
+        hour = t // 3600
+        offset = self._by_hour.get(hour)
+        if offset is None:
+            dt = datetime.fromtimestamp(hour * 3600, tz=timezone.utc).astimezone(self.tz)
+            offset = int(dt.utcoffset().total_seconds())
+            self._by_hour[hour] = offset
+        return offset
+
+
+def _bucket_start(t: int, offset: int, seconds: int) -> int:
+    local = t + offset
+    if seconds == 86400:
+        return local - local % 86400 - offset
+    # Intraday buckets are anchored to the session open (09:30, 09:45, ... for 15m)
+    return local - (local - _SESSION_OPEN_SECONDS) % seconds - offset
+
+
+def resample_columns(cols: BarColumns, timeframes: Iterable[str]) -> Dict[str, BarColumns]:
+    # Group-by over sorted bars: bucket keys are computed per timeframe, runs of equal
+    # keys are found once, and OHLCV aggregation uses C-level builtins on slices.
+    offsets_for = UtcOffsetCache()
+    offsets = [offsets_for(t) for t in cols.time]
+    n = len(cols)
+    out: Dict[str, BarColumns] = {}
+    for tf in timeframes:
+        seconds = timeframe_seconds(tf)
+        keys = [_bucket_start(t, o, seconds) for t, o in zip(cols.time, offsets)]
+        starts = [i for i in range(n) if i == 0 or keys[i] != keys[i - 1]]
+        ends = starts[1:] + [n]
+        out[tf] = BarColumns(
+            symbol=cols.symbol,
+            time=array("q", [keys[a] for a in starts]),
+            open=array("d", [cols.open[a] for a in starts]),
+            high=array("d", [max(cols.high[a:b]) for a, b in zip(starts, ends)]),
+            low=array("d", [min(cols.low[a:b]) for a, b in zip(starts, ends)]),
+            close=array("d", [cols.close[b - 1] for b in ends]),
+            volume=array("d", [sum(cols.volume[a:b]) for a, b in zip(starts, ends)]),
+        )
+    return out
+
+
+def resample_bars(bars: List[Bar], timeframe: str) -> List[Bar]:
+    if not bars:
+        return []
+    cols = BarColumns.from_bars(bars[0].symbol, sorted(bars, key=lambda b: b.time))
+    return resample_columns(cols, [timeframe])[timeframe].to_bars()
+
+
+class StreamingResampler:
+    def __init__(self, symbol: str, timeframe: str):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.seconds = timeframe_seconds(timeframe)
+        self._offsets = UtcOffsetCache()
+        self._current: Optional[Bar] = None
+
+    @property
+    def partial(self) -> Optional[Bar]:
+        return self._current
+
+    def update(self, bar: Bar) -> Optional[Bar]:
+        # Returns the completed bar when `bar` opens a new bucket
+        start = _bucket_start(int(bar.time), self._offsets(int(bar.time)), self.seconds)
+        current = self._current
+        if current is not None and start == current.time:
+            current.high = max(current.high, bar.high)
+            current.low = min(current.low, bar.low)
+            current.close = bar.close
+            current.volume += bar.volume
+            return None
+        self._current = Bar(self.symbol, start, bar.open, bar.high, bar.low, bar.close, bar.volume)
+        return current
+
+    def flush(self) -> Optional[Bar]:
+        current, self._current = self._current, None
+        return current
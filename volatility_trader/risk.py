@@ -1,4 +1,6 @@
 from __future__ import annotations
+from typing import Mapping
+from .config import STRATEGY_RULES
 
 
 def calculate_shares(account_equity: float, entry_price: float, stop_price: float, risk_fraction: float = 0.01) -> int:
@@ -9,20 +11,20 @@ def calculate_shares(account_equity: float, entry_price: float, stop_price: floa
     return int(risk_amount / price_risk)
 
 
-def calculate_stop_loss(signal_type: str, entry_price: float, atr: float) -> float:
+def calculate_stop_loss(signal_type: str, entry_price: float, atr: float, rules: Mapping = STRATEGY_RULES) -> float:
     if signal_type == "BREAKOUT":
-        return entry_price - (2.0 * atr)
+        return entry_price - (rules["breakout_stop_atr"] * atr)
     if signal_type == "REVERSAL":
-        return entry_price - (1.5 * atr)
+        return entry_price - (rules["reversal_stop_atr"] * atr)
     raise ValueError("Unknown signal_type")
 
 
-def calculate_take_profit(entry_price: float, stop_price: float, signal_type: str) -> float:
+def calculate_take_profit(entry_price: float, stop_price: float, signal_type: str, rules: Mapping = STRATEGY_RULES) -> float:
     risk = abs(entry_price - stop_price)
     if risk <= 0:
         return entry_price
     if signal_type == "BREAKOUT":
-        return entry_price + (3.0 * risk)
+        return entry_price + (rules["breakout_reward_risk"] * risk)
     if signal_type == "REVERSAL":
-        return entry_price + (2.5 * risk)
+        return entry_price + (rules["reversal_reward_risk"] * risk)
     raise ValueError("Unknown signal_type")
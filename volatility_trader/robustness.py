@@ -0,0 +1,316 @@
+from __future__ import annotations
+import random
+from array import array
+from dataclasses import dataclass
+from itertools import repeat
+from math import sqrt
+from operator import itemgetter, mod
+from typing import List, Optional, Sequence, Tuple
+
+from .metrics import Trade, Daily, profit_factor, max_drawdown, sharpe_ratio
+
+try:
+    import numpy as np
+except ImportError:  # optional; without it resampling runs in the stdlib loops below
+    np = None
+
+# Values per batch of resamples: index rows and paths stay a few MB whatever the sample count
+_BATCH_VALUES = 1 << 18
+
+
+@dataclass
+class ConfidenceInterval:
+    low: float
+    median: float
+    high: float
+
+
+@dataclass
+class RobustnessReport:
+    method: str
+    samples: int
+    confidence: float
+    sharpe_ratio: ConfidenceInterval
+    max_drawdown: ConfidenceInterval
+    profit_factor: ConfidenceInterval
+
+
+@dataclass
+class WalkForwardWindow:
+    train: range
+    test: range
+    train_sharpe: float
+    test_sharpe: float
+    test_max_drawdown: float
+    test_profit_factor: float
+    test_trades: int
+
+
+def _block(block_size: int, n: int) -> int:
+    return max(1, min(block_size, n))
+
+
+def _indices(rng: random.Random, n: int, count: int) -> List[int]:
+    # Random words reduced modulo n, drawn in one call; the bias is at most n / 2**32
+    words = array("I")
+    words.frombytes(rng.randbytes(words.itemsize * count))
+    return list(map(mod, words, repeat(n)))
+
+
+def _rows(kind: str, rng: random.Random, n: int, rows: int, block_size: int) -> List[Sequence[int]]:
+    # Index rows for `rows` resamples, drawn a batch at a time
+    if kind == "shuffle":
+        return [rng.sample(range(n), n) for _ in range(rows)]
+    if kind == "blocks":
+        # Circular block bootstrap keeps short-range autocorrelation inside each block
+        size = _block(block_size, n)
+        per = -(-n // size)
+        wrapped = list(range(n)) + list(range(size - 1))
+        starts = _indices(rng, n, rows * per)
+        out: List[Sequence[int]] = []
+        for r in range(rows):
+            row: List[int] = []
+            for start in starts[r * per:(r + 1) * per]:
+                row.extend(wrapped[start:start + size])
+            out.append(row[:n])
+        return out
+    idx = _indices(rng, n, rows * n)
+    return [idx[r * n:(r + 1) * n] for r in range(rows)]
+
+
+def _take(values: Sequence[float], row: Sequence[int]) -> Sequence[float]:
+    return itemgetter(*row)(values) if len(row) > 1 else [values[i] for i in row]
+
+
+def _sharpe_from_sums(offset: float, total: float, squares: float, n: int) -> float:
+    # sharpe_ratio from the sum and sum of squares of values centred on `offset`
+    if n <= 1:
+        return 0.0
+    mean = offset + total / n
+    var = (squares - total * total / n) / (n - 1)
+    std = sqrt(var) if var > 0 else 0.0
+    return (mean / std) * sqrt(252) if std > 0 else 0.0
+
+
+def _factor_from_sums(gross_win: float, gross_loss: float) -> float:
+    if gross_loss > 0:
+        return gross_win / gross_loss
+    return float("inf") if gross_win > 0 else 0.0
+
+
+def _daily_stats(
+    kind: str, rng: random.Random, values: Sequence[float], rows: int, block_size: int, with_sharpe: bool
+) -> Tuple[List[float], List[float]]:
+    n = len(values)
+    offset = sum(values) / n
+    centred = [x - offset for x in values]
+    squares = [c * c for c in centred]
+    drawdowns: List[float] = []
+    sharpes: List[float] = []
+    for row in _rows(kind, rng, n, rows, block_size):
+        drawdowns.append(max_drawdown(_take(values, row)))
+        if with_sharpe:
+            sharpes.append(_sharpe_from_sums(offset, sum(_take(centred, row)), sum(_take(squares, row)), n))
+    return drawdowns, sharpes
+
+
+def _trade_factors(kind: str, rng: random.Random, values: Sequence[float], rows: int, block_size: int) -> List[float]:
+    wins = [max(p, 0.0) for p in values]
+    losses = [max(-p, 0.0) for p in values]
+    return [
+        _factor_from_sums(sum(_take(wins, row)), sum(_take(losses, row)))
+        for row in _rows(kind, rng, len(values), rows, block_size)
+    ]
+
+
+def _rows_np(kind: str, gen, n: int, rows: int, block_size: int):
+    # The resampling schemes of _rows as one (rows, n) index matrix
+    if kind == "shuffle":
+        return gen.permuted(np.broadcast_to(np.arange(n), (rows, n)), axis=1)
+    if kind == "blocks":
+        size = _block(block_size, n)
+        per = -(-n // size)
+        starts = gen.integers(0, n, size=(rows, per, 1))
+        return ((starts + np.arange(size)) % n).reshape(rows, per * size)[:, :n]
+    return gen.integers(0, n, size=(rows, n))
+
+
+def _daily_stats_np(
+    kind: str, gen, values: Sequence[float], rows: int, block_size: int, with_sharpe: bool
+) -> Tuple[List[float], List[float]]:
+    n = len(values)
+    series = np.asarray(values, dtype=float)
+    paths = series[_rows_np(kind, gen, n, rows, block_size)]
+    # Same arithmetic as max_drawdown, one row per resample
+    equity = np.cumsum(paths, axis=1)
+    peaks = np.maximum.accumulate(np.maximum(equity, 0.0), axis=1)
+    ratios = np.divide(equity - peaks, peaks, out=np.zeros_like(equity), where=peaks > 0)
+    drawdowns = np.abs(np.minimum(ratios.min(axis=1), 0.0)).tolist()
+    if not with_sharpe:
+        return drawdowns, []
+    if n <= 1:
+        return drawdowns, [0.0] * rows
+    offset = float(series.mean())
+    centred = paths - offset
+    total = centred.sum(axis=1)
+    squares = np.einsum("ij,ij->i", centred, centred)
+    std = np.sqrt(np.maximum((squares - total * total / n) / (n - 1), 0.0))
+    sharpes = np.divide((offset + total / n) * sqrt(252), std, out=np.zeros(rows), where=std > 0)
+    return drawdowns, sharpes.tolist()
+
+
+def _trade_factors_np(kind: str, gen, values: Sequence[float], rows: int, block_size: int) -> List[float]:
+    pnls = np.asarray(values, dtype=float)
+    paths = pnls[_rows_np(kind, gen, len(values), rows, block_size)]
+    gross_win = np.maximum(paths, 0.0).sum(axis=1)
+    gross_loss = -np.minimum(paths, 0.0).sum(axis=1)
+    fallback = np.where(gross_win > 0, np.inf, 0.0)
+    return np.divide(gross_win, gross_loss, out=fallback, where=gross_loss > 0).tolist()
+
+
+def _interval(values: List[float], confidence: float) -> ConfidenceInterval:
+    if not values:
+        return ConfidenceInterval(0.0, 0.0, 0.0)
+    ordered = sorted(values)
+    tail = (1 - confidence) / 2
+    return ConfidenceInterval(
+        low=_percentile(ordered, tail),
+        median=_percentile(ordered, 0.5),
+        high=_percentile(ordered, 1 - tail),
+    )
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    pos = q * (len(ordered) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    if ordered[lo] == ordered[hi]:
+        return ordered[lo]
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def _run(
+    method: str,
+    kind: str,
+    trades: Sequence[Trade],
+    dailies: Sequence[Daily],
+    samples: int,
+    confidence: float,
+    seed: Optional[int],
+    block_size: int = 1,
+) -> RobustnessReport:
+    rng = random.Random(seed)
+    trade_pnls = [t.pnl for t in trades]
+    daily_pnls = [d.pnl for d in dailies]
+    sharpes: List[float] = []
+    drawdowns: List[float] = []
+    factors: List[float] = []
+    # Sharpe and profit factor do not depend on order, so a permutation only moves drawdown
+    order_only = kind == "shuffle"
+    if np is not None:
+        # Seeded from `rng`, so a seed still fixes the result for a given backend
+        source = np.random.default_rng(rng.getrandbits(64))
+        daily_stats, trade_factors = _daily_stats_np, _trade_factors_np
+    else:
+        source = rng
+        daily_stats, trade_factors = _daily_stats, _trade_factors
+    # Indices are drawn a batch of resamples at a time, capped at about _BATCH_VALUES values
+    batch = max(1, _BATCH_VALUES // max(len(daily_pnls), len(trade_pnls), 1))
+    done = 0
+    while done < samples:
+        rows = min(batch, samples - done)
+        if daily_pnls:
+            dd, sh = daily_stats(kind, source, daily_pnls, rows, block_size, not order_only)
+            drawdowns.extend(dd)
+            sharpes.extend(sh)
+        if trade_pnls and not order_only:
+            factors.extend(trade_factors(kind, source, trade_pnls, rows, block_size))
+        done += rows
+    if order_only:
+        sharpes = [sharpe_ratio(daily_pnls)] if daily_pnls else []
+        factors = [profit_factor(trade_pnls)] if trade_pnls else []
+    return RobustnessReport(
+        method=method,
+        samples=samples,
+        confidence=confidence,
+        sharpe_ratio=_interval(sharpes, confidence),
+        max_drawdown=_interval(drawdowns, confidence),
+        profit_factor=_interval(factors, confidence),
+    )
+
+
+def bootstrap(
+    trades: Sequence[Trade],
+    dailies: Sequence[Daily],
+    samples: int = 10_000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+) -> RobustnessReport:
+    return _run("bootstrap", "iid", trades, dailies, samples, confidence, seed)
+
+
+def block_bootstrap(
+    trades: Sequence[Trade],
+    dailies: Sequence[Daily],
+    block_size: int = 5,
+    samples: int = 10_000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+) -> RobustnessReport:
+    return _run("block_bootstrap", "blocks", trades, dailies, samples, confidence, seed, block_size)
+
+
+def permutation(
+    trades: Sequence[Trade],
+    dailies: Sequence[Daily],
+    samples: int = 10_000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+) -> RobustnessReport:
+    return _run("permutation", "shuffle", trades, dailies, samples, confidence, seed)
+
+
+def walk_forward_splits(n_days: int, train_days: int, test_days: int, step: Optional[int] = None) -> List[Tuple[range, range]]:
+    if train_days <= 0 or test_days <= 0:
+        raise ValueError("train_days and test_days must be positive")
+    step = step or test_days
+    splits: List[Tuple[range, range]] = []
+    start = 0
+    while start + train_days + test_days <= n_days:
+        train = range(start, start + train_days)
+        test = range(start + train_days, start + train_days + test_days)
+        splits.append((train, test))
+        start += step
+    return splits
+
+
+def walk_forward(
+    trades: Sequence[Trade],
+    dailies: Sequence[Daily],
+    train_days: int,
+    test_days: int,
+    step: Optional[int] = None,
+) -> List[WalkForwardWindow]:
+    daily_pnls = [d.pnl for d in dailies]
+    windows: List[WalkForwardWindow] = []
+    for train, test in walk_forward_splits(len(dailies), train_days, test_days, step):
+        test_pnls = daily_pnls[test.start:test.stop]
+        # Trades belong to the window whose days span their exit time
+        first = dailies[test.start - 1].time
+        last = dailies[test.stop - 1].time
+        window_trades = [
+            t.pnl for t in trades
+            if t.exit_time is not None and first is not None and last is not None and first < t.exit_time <= last
+        ]
+        windows.append(
+            WalkForwardWindow(
+                train=train,
+                test=test,
+                train_sharpe=sharpe_ratio(daily_pnls[train.start:train.stop]),
+                test_sharpe=sharpe_ratio(test_pnls),
+                test_max_drawdown=max_drawdown(test_pnls),
+                test_profit_factor=profit_factor(window_trades),
+                test_trades=len(window_trades),
+            )
+        )
+    return windows
@@ -1,16 +1,14 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from datetime import datetime, time
-from typing import List, Optional
+import threading
+from collections import Counter, OrderedDict
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple, Union
 
 from .types import Bar, SignalContext
 from .indicators import ema as ema_series, rsi as rsi_series, atr as atr_series, bollinger, rvol as rvol_series
-from .config import TRADING_SCHEDULE
-
-
-ET_SCAN_TIMES = [time.fromisoformat(t) for t in TRADING_SCHEDULE["scan_times_et"]]
-NO_NEW_AFTER = time.fromisoformat(TRADING_SCHEDULE["no_new_after_et"])
-CLOSE_ALL_BY = time.fromisoformat(TRADING_SCHEDULE["close_all_by_et"])
+from .config import DEFAULT_CONFIG, Config
 
 
 @dataclass
@@ -25,8 +23,22 @@ class ComputedSeries:
     rvol: float
 
 
-def build_signal_context(bars: List[Bar]) -> Optional[SignalContext]:
-    if len(bars) < 200:
+@dataclass(frozen=True)
+class IndicatorParams:
+    ema_fast: int = 50
+    ema_slow: int = 200
+    rsi_period: int = 14
+    atr_period: int = 14
+    bb_period: int = 20
+    bb_std: float = 2.0
+    rvol_lookback: int = 20
+
+
+DEFAULT_INDICATOR_PARAMS = IndicatorParams()
+
+
+def build_signal_context(bars: List[Bar], params: IndicatorParams = DEFAULT_INDICATOR_PARAMS) -> Optional[SignalContext]:
+    if len(bars) < params.ema_slow:
         return None
 
     closes = [b.close for b in bars]
@@ -34,12 +46,12 @@ def build_signal_context(bars: List[Bar]) -> Optional[SignalContext]:
     lows = [b.low for b in bars]
     vols = [b.volume for b in bars]
 
-    ema50_series = ema_series(closes, 50)
-    ema200_series = ema_series(closes, 200)
-    rsi_vals = rsi_series(closes, 14)
-    atr_vals = atr_series(highs, lows, closes, 14)
-    bb_lower, bb_ma, bb_upper = bollinger(closes, 20, 2.0)
-    rvol_vals = rvol_series(vols, 20)
+    ema50_series = ema_series(closes, params.ema_fast)
+    ema200_series = ema_series(closes, params.ema_slow)
+    rsi_vals = rsi_series(closes, params.rsi_period)
+    atr_vals = atr_series(highs, lows, closes, params.atr_period)
+    bb_lower, bb_ma, bb_upper = bollinger(closes, params.bb_period, params.bb_std)
+    rvol_vals = rvol_series(vols, params.rvol_lookback)
 
     latest_price = closes[-1]
     ema50 = ema50_series[-1] if len(ema50_series) > 0 else latest_price
@@ -66,14 +78,256 @@ def build_signal_context(bars: List[Bar]) -> Optional[SignalContext]:
     )
 
 
-def is_scan_time_et(now_et: datetime) -> bool:
-    t = now_et.time()
-    return any(abs((datetime.combine(now_et.date(), st) - now_et).total_seconds()) <= 60 for st in ET_SCAN_TIMES)
+class LazySignalContext:
+    # Same fields as SignalContext, each computed on first access from bars[:end] and
+    # memoized. RVOL and Bollinger only read their trailing window; ATR, RSI and the EMAs
+    # need the whole series. `evaluations` counts how often each indicator was computed,
+    # updated under `lock` when the counter is shared between threads.
+    def __init__(
+        self,
+        bars: Sequence[Bar],
+        end: int,
+        params: IndicatorParams = DEFAULT_INDICATOR_PARAMS,
+        evaluations: Optional[Counter] = None,
+        lock: Optional[AbstractContextManager] = None,
+    ):
+        self._bars = bars
+        self._end = end
+        self._params = params
+        self._evaluations = evaluations if evaluations is not None else Counter()
+        self._lock = lock if lock is not None else nullcontext()
+        self._values: dict = {}
+        self.price = bars[end - 1].close
+
+    def _closes(self, count: Optional[int] = None) -> List[float]:
+        start = 0 if count is None else max(0, self._end - count)
+        return [b.close for b in self._bars[start:self._end]]
+
+    def _computed(self, name: str):
+        if name not in self._values:
+            with self._lock:
+                self._evaluations[name] += 1
+            self._values[name] = getattr(self, f"_compute_{name}")()
+        return self._values[name]
+
+    def _compute_rvol(self) -> float:
+        lookback = self._params.rvol_lookback
+        vols = [b.volume for b in self._bars[max(0, self._end - lookback - 1):self._end]]
+        vals = rvol_series(vols, lookback)
+        return vals[-1] if vals else 0.0
+
+    def _compute_atr(self) -> float:
+        bars = self._bars[:self._end]
+        vals = atr_series([b.high for b in bars], [b.low for b in bars], [b.close for b in bars], self._params.atr_period)
+        return vals[-1] if vals else 0.0
+
+    def _compute_rsi(self) -> float:
+        vals = rsi_series(self._closes(), self._params.rsi_period)
+        return vals[-1] if vals else 50.0
+
+    def _compute_bollinger(self) -> Tuple[float, float]:
+        lower, _, upper = bollinger(self._closes(self._params.bb_period), self._params.bb_period, self._params.bb_std)
+        if not lower:
+            return self.price, self.price
+        return upper[-1], lower[-1]
+
+    def _compute_ema_fast(self) -> float:
+        vals = ema_series(self._closes(), self._params.ema_fast)
+        return vals[-1] if vals else self.price
+
+    def _compute_ema_slow(self) -> float:
+        vals = ema_series(self._closes(), self._params.ema_slow)
+        return vals[-1] if vals else self.price
+
+    @property
+    def rvol(self) -> float:
+        return self._computed("rvol")
+
+    @property
+    def atr_percent(self) -> float:
+        atr = self._computed("atr")
+        return (atr / self.price) * 100 if self.price != 0 else 0.0
+
+    @property
+    def rsi(self) -> float:
+        return self._computed("rsi")
+
+    @property
+    def bb_upper(self) -> float:
+        return self._computed("bollinger")[0]
+
+    @property
+    def bb_lower(self) -> float:
+        return self._computed("bollinger")[1]
+
+    @property
+    def bb_width(self) -> float:
+        bb_u, bb_l = self._computed("bollinger")
+        return (bb_u - bb_l) / bb_l * 100 if bb_l != 0 else 0.0
+
+    @property
+    def ema50(self) -> float:
+        return self._computed("ema_fast")
+
+    @property
+    def ema200(self) -> float:
+        return self._computed("ema_slow")
+
+    def materialize(self) -> SignalContext:
+        return SignalContext(
+            rvol=self.rvol,
+            atr_percent=self.atr_percent,
+            rsi=self.rsi,
+            price=self.price,
+            bb_upper=self.bb_upper,
+            bb_lower=self.bb_lower,
+            bb_width=self.bb_width,
+            ema50=self.ema50,
+            ema200=self.ema200,
+        )
+
+
+AnySignalContext = Union[SignalContext, LazySignalContext]
+
+_MISSING = object()
+
+
+class SignalContextCache:
+    # LRU of contexts keyed by (symbol, series identity, bar time, bar count, params).
+    # Bar times alone cannot tell two datasets on the same time grid apart, so full
+    # histories are keyed by a fingerprint of their contents and lazy contexts by the
+    # list they read from. Safe to share between threads.
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # Indicator computations made by lazy contexts handed out by this cache
+        self.evaluations: Counter = Counter()
+        self._entries: "OrderedDict[Hashable, Optional[AnySignalContext]]" = OrderedDict()
+        # Keys of lazy contexts by the id of the list they read from, for release()
+        self._by_series: Dict[int, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, symbol: str, bars: List[Bar], params: IndicatorParams) -> Tuple:
+        fingerprint = hash(tuple((b.time, b.open, b.high, b.low, b.close, b.volume) for b in bars))
+        return (symbol, fingerprint, bars[-1].time, len(bars), params)
+
+    def _lookup(self, key: Tuple) -> Tuple[bool, Optional[AnySignalContext]]:
+        with self._lock:
+            ctx = self._entries.get(key, _MISSING)
+            if ctx is _MISSING:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return True, ctx
+
+    def _store(self, key: Tuple, ctx: Optional[AnySignalContext], series: Optional[int] = None) -> None:
+        with self._lock:
+            self._entries[key] = ctx
+            if series is not None:
+                self._by_series.setdefault(series, set()).add(key)
+            if len(self._entries) > self.maxsize:
+                old, _ = self._entries.popitem(last=False)
+                keys = self._by_series.get(old[1])
+                if keys is not None:
+                    keys.discard(old)
+                    if not keys:
+                        del self._by_series[old[1]]
+
+    def get(self, symbol: str, bars: List[Bar], params: IndicatorParams = DEFAULT_INDICATOR_PARAMS) -> Optional[AnySignalContext]:
+        if len(bars) < params.ema_slow:
+            return None
+        key = self.key(symbol, bars, params)
+        found, ctx = self._lookup(key)
+        if not found:
+            ctx = build_signal_context(bars, params)
+            self._store(key, ctx)
+        return ctx
+
+    def get_lazy(
+        self,
+        symbol: str,
+        bars: Sequence[Bar],
+        end: int,
+        params: IndicatorParams = DEFAULT_INDICATOR_PARAMS,
+    ) -> Optional[AnySignalContext]:
+        # Context for bars[:end] without copying the prefix. `bars` may grow afterwards but
+        # must not be modified before `end` while the context is cached.
+        if end < params.ema_slow:
+            return None
+        # The cached context holds `bars`, so its id cannot be reused by another list while
+        # any entry keyed on it is alive
+        key = (symbol, id(bars), bars[end - 1].time, end, params)
+        found, ctx = self._lookup(key)
+        if not found:
+            ctx = LazySignalContext(bars, end, params, self.evaluations, self._lock)
+            self._store(key, ctx, id(bars))
+        return ctx
+
+    def release(self, bars: Sequence[Bar]) -> None:
+        # Drops the lazy contexts reading from `bars`, e.g. a chunk's history that has been
+        # replaced and will not be read again, so the cache no longer keeps it alive
+        with self._lock:
+            for key in self._by_series.pop(id(bars), ()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_series.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evaluations.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evaluations": dict(self.evaluations),
+            }
+
+
+def priced_at(ctx: AnySignalContext, price: float) -> SignalContext:
+    # `ctx` moved to `price`, with ATR% re-expressed against it; the other indicators stay
+    if isinstance(ctx, LazySignalContext):
+        ctx = ctx.materialize()
+    atr = ctx.atr_percent * ctx.price / 100
+    return replace(ctx, price=price, atr_percent=(atr / price) * 100 if price != 0 else 0.0)
+
+
+def build_mixed_context(
+    intraday_bars: List[Bar],
+    daily_bars: List[Bar],
+    params: IndicatorParams = DEFAULT_INDICATOR_PARAMS,
+) -> Optional[SignalContext]:
+    # Daily-semantics indicators (RVOL, ATR%, Bollinger, EMAs) priced at the latest intraday bar
+    ctx = build_signal_context(daily_bars, params)
+    if ctx is None or not intraday_bars:
+        return ctx
+    return priced_at(ctx, intraday_bars[-1].close)
+
+
+def _seconds_of_day(now_et: datetime) -> float:
+    return now_et.hour * 3600 + now_et.minute * 60 + now_et.second + now_et.microsecond / 1e6
+
+
+def is_scan_time_et(now_et: datetime, config: Config = DEFAULT_CONFIG) -> bool:
+    # Within a minute either side of a scheduled scan
+    now = _seconds_of_day(now_et)
+    return any(abs(scan - now) <= 60 for scan in config.scan_seconds_et)
 
 
-def within_entry_window(now_et: datetime) -> bool:
-    return now_et.time() < NO_NEW_AFTER
+def within_entry_window(now_et: datetime, config: Config = DEFAULT_CONFIG) -> bool:
+    return _seconds_of_day(now_et) < config.no_new_after_seconds_et
 
 
-def close_all_time(now_et: datetime) -> bool:
-    return now_et.time() >= CLOSE_ALL_BY
+def close_all_time(now_et: datetime, config: Config = DEFAULT_CONFIG) -> bool:
+    return _seconds_of_day(now_et) >= config.close_all_by_seconds_et
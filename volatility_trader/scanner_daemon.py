@@ -0,0 +1,232 @@
+from __future__ import annotations
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .types import Bar, Decision, SignalContext
+from .config import DEFAULT_CONFIG, Config
+from .scanner import DEFAULT_INDICATOR_PARAMS, IndicatorParams
+from .signals import evaluate_breakout, evaluate_reversal
+from .indicator_store import RollingIndicators
+
+# Protocol: one JSON object per line in each direction, answered in order. Requests:
+#   {"op": "ingest", "bars": [{"symbol", "time", "open", "high", "low", "close", "volume"}, ...]}
+#   {"op": "context", "symbols": [...]}      symbols defaults to every known symbol
+#   {"op": "decide", "symbols": [...]}
+#   {"op": "rank", "limit": 20, "all": false}  entries first, then by RVOL
+#   {"op": "stats"}
+# Every reply carries "ok"; failures carry "error" instead of results.
+
+
+class ScannerState:
+    # Per-symbol warm indicator windows. Contexts and decisions are memoized until the
+    # symbol's next bar, so repeated queries between bars are dictionary lookups.
+    def __init__(
+        self,
+        params: IndicatorParams = DEFAULT_INDICATOR_PARAMS,
+        config: Config = DEFAULT_CONFIG,
+        keep: int = 256,
+    ):
+        self.params = params
+        self.config = config
+        self.keep = keep
+        self.symbols: Dict[str, RollingIndicators] = {}
+        self.stale = 0
+        self._lock = threading.Lock()
+        self._contexts: Dict[str, Optional[SignalContext]] = {}
+        self._decisions: Dict[str, Optional[Decision]] = {}
+
+    def ingest(self, bars: Iterable[Bar]) -> int:
+        # Bars at or before a symbol's latest time are counted as stale and skipped
+        count = 0
+        with self._lock:
+            for bar in bars:
+                window = self.symbols.get(bar.symbol)
+                if window is None:
+                    window = self.symbols[bar.symbol] = RollingIndicators(bar.symbol, self.params, self.keep)
+                elif bar.time <= window.bars.time[-1]:
+                    self.stale += 1
+                    continue
+                window.append(bar)
+                self._contexts.pop(bar.symbol, None)
+                self._decisions.pop(bar.symbol, None)
+                count += 1
+        return count
+
+    def context(self, symbol: str) -> Optional[SignalContext]:
+        if symbol not in self._contexts:
+            window = self.symbols.get(symbol)
+            self._contexts[symbol] = window.context() if window else None
+        return self._contexts[symbol]
+
+    def decide(self, symbol: str) -> Optional[Decision]:
+        # Same breakout-then-reversal evaluation the backtester runs at a scan
+        if symbol not in self._decisions:
+            ctx = self.context(symbol)
+            decision = None
+            if ctx is not None:
+                window = self.symbols[symbol]
+                rules = self.config.strategy_rules
+                decision = evaluate_breakout(
+                    ctx,
+                    bb_width_is_20d_low=lambda: window.breakout_inputs()[0],
+                    todays_volume_gt_yday=lambda: window.breakout_inputs()[1],
+                    rules=rules,
+                )
+                if not decision.should_enter:
+                    decision = evaluate_reversal(ctx, rules=rules)
+            self._decisions[symbol] = decision
+        return self._decisions[symbol]
+
+    def rank(self, limit: int = 20, include_all: bool = False) -> List[Tuple[str, Decision, SignalContext]]:
+        ranked = []
+        for symbol in self.symbols:
+            decision = self.decide(symbol)
+            if decision is None or not (decision.should_enter or include_all):
+                continue
+            ranked.append((symbol, decision, self.context(symbol)))
+        ranked.sort(key=lambda row: (not row[1].should_enter, -row[2].rvol))
+        return ranked[:limit]
+
+    def handle(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ingest":
+            return {"ok": True, "ingested": self.ingest(Bar(**row) for row in request.get("bars", []))}
+        with self._lock:
+            if op == "context":
+                symbols = request.get("symbols") or list(self.symbols)
+                return {"ok": True, "results": {s: _context_dict(self.context(s)) for s in symbols}}
+            if op == "decide":
+                symbols = request.get("symbols") or list(self.symbols)
+                return {"ok": True, "results": {s: _decision_dict(self.decide(s)) for s in symbols}}
+            if op == "rank":
+                rows = self.rank(int(request.get("limit", 20)), bool(request.get("all", False)))
+                return {
+                    "ok": True,
+                    "results": [
+                        {"symbol": s, **_decision_dict(d), "context": _context_dict(ctx)} for s, d, ctx in rows
+                    ],
+                }
+            if op == "stats":
+                return {
+                    "ok": True,
+                    "symbols": len(self.symbols),
+                    "bars": sum(w.count for w in self.symbols.values()),
+                    "stale": self.stale,
+                }
+        return {"ok": False, "error": f"Unknown op: {op!r}"}
+
+
+def _context_dict(ctx: Optional[SignalContext]) -> Optional[dict]:
+    return asdict(ctx) if ctx is not None else None
+
+
+def _decision_dict(decision: Optional[Decision]) -> Optional[dict]:
+    return asdict(decision) if decision is not None else None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        state: ScannerState = self.server.state  # type: ignore[attr-defined]
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                reply = state.handle(json.loads(line))
+            except (ValueError, TypeError, KeyError, AttributeError) as exc:
+                reply = {"ok": False, "error": str(exc)}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+def _is_listening(path: str) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+class ScannerDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, state: Optional[ScannerState] = None):
+        # A stale socket left by an earlier daemon is replaced. A socket that still accepts
+        # connections, or anything that is not a socket, is refused.
+        try:
+            mode = os.lstat(path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(f"Refusing to replace non-socket path: {path}")
+            if _is_listening(path):
+                raise FileExistsError(f"Another daemon is serving {path}")
+            os.unlink(path)
+        self.path = path
+        self.state = state if state is not None else ScannerState()
+        self._bound: Optional[os.stat_result] = None
+        super().__init__(path, _Handler)
+        # Identifies the socket this server bound, so server_close never removes a replacement
+        self._bound = os.lstat(path)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self._bound is None:
+            return
+        try:
+            current = os.lstat(self.path)
+        except FileNotFoundError:
+            return
+        if stat.S_ISSOCK(current.st_mode) and (current.st_dev, current.st_ino) == (self._bound.st_dev, self._bound.st_ino):
+            os.unlink(self.path)
+
+
+class ScannerClient:
+    # Keeps one connection open; `request` sends a line and waits for its reply
+    def __init__(self, path: str, timeout: Optional[float] = 10.0):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(path)
+        self._file = self._sock.makefile("rwb")
+
+    def request(self, payload: dict) -> dict:
+        self._file.write(json.dumps(payload).encode("utf-8") + b"\n")
+        self._file.flush()
+        return json.loads(self._file.readline())
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "ScannerClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def serve(path: str, symbol_to_bars: Optional[Dict[str, List[Bar]]] = None, state: Optional[ScannerState] = None) -> None:
+    # Warms the state with any bars already loaded, then serves until interrupted
+    daemon = ScannerDaemon(path, state)
+    if symbol_to_bars:
+        started = time.perf_counter()
+        for bars in symbol_to_bars.values():
+            daemon.state.ingest(bars)
+        elapsed = time.perf_counter() - started
+        print(json.dumps({"serving": path, "symbols": len(daemon.state.symbols), "warm_s": round(elapsed, 3)}), flush=True)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
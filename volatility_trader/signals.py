@@ -1,38 +1,45 @@
 from __future__ import annotations
+from typing import Callable, Mapping, Union
 from .types import SignalContext, Decision
+from .config import STRATEGY_RULES
 
 BREAKOUT = "BREAKOUT"
 REVERSAL = "REVERSAL"
 
-REQUIRED_RVOL = 1.8
-REQUIRED_ATR_PCT = 4.0
+# A precomputed flag, or a callable evaluated only once the gates before it have passed
+LazyFlag = Union[bool, Callable[[], bool]]
+
+
+def _resolve(flag: LazyFlag) -> bool:
+    return flag() if callable(flag) else flag
 
 
 def evaluate_breakout(
     ctx: SignalContext,
-    bb_width_is_20d_low: bool,
-    todays_volume_gt_yday: bool,
+    bb_width_is_20d_low: LazyFlag,
+    todays_volume_gt_yday: LazyFlag,
+    rules: Mapping = STRATEGY_RULES,
 ) -> Decision:
-    if ctx.rvol <= REQUIRED_RVOL:
+    if ctx.rvol <= rules["required_rvol"]:
         return Decision(False, "RVOL fail")
-    if ctx.atr_percent <= REQUIRED_ATR_PCT:
+    if ctx.atr_percent <= rules["required_atr_pct"]:
         return Decision(False, "ATR% fail")
     if ctx.price <= ctx.bb_upper:
         return Decision(False, "Price not > upper BB")
-    if not bb_width_is_20d_low:
+    if not _resolve(bb_width_is_20d_low):
         return Decision(False, "BB width not at 20d low")
-    if not todays_volume_gt_yday:
+    if not _resolve(todays_volume_gt_yday):
         return Decision(False, "Volume not > yesterday")
     return Decision(True, "BREAKOUT pass", BREAKOUT, ctx.price)
 
 
-def evaluate_reversal(ctx: SignalContext) -> Decision:
-    if ctx.rvol <= REQUIRED_RVOL:
+def evaluate_reversal(ctx: SignalContext, rules: Mapping = STRATEGY_RULES) -> Decision:
+    if ctx.rvol <= rules["required_rvol"]:
         return Decision(False, "RVOL fail")
-    if ctx.atr_percent <= REQUIRED_ATR_PCT:
+    if ctx.atr_percent <= rules["required_atr_pct"]:
         return Decision(False, "ATR% fail")
-    if ctx.rsi >= 35:
-        return Decision(False, "RSI not < 35")
+    if ctx.rsi >= rules["reversal_rsi_max"]:
+        return Decision(False, f"RSI not < {rules['reversal_rsi_max']}")
     if ctx.price > ctx.bb_lower:
         return Decision(False, "Price not ≤ lower BB")
     if ctx.ema50 <= ctx.ema200:
@@ -0,0 +1,219 @@
+from __future__ import annotations
+import csv
+import json
+import os
+import struct
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from .types import Fill, Position
+from .metrics import Trade
+
+# Column typecodes follow the array module; "s" marks a UTF-8 string column
+SCHEMAS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "trades": (
+        ("symbol", "s"),
+        ("entry_time", "q"),
+        ("exit_time", "q"),
+        ("pnl", "d"),
+        ("duration_bars", "q"),
+        ("time_in_drawdown_bars", "q"),
+        ("adhered_to_plan", "b"),
+    ),
+    "fills": (
+        ("time", "q"),
+        ("symbol", "s"),
+        ("side", "s"),
+        ("order_type", "s"),
+        ("quantity", "q"),
+        ("price", "d"),
+    ),
+    "equity": (
+        ("time", "q"),
+        ("equity", "d"),
+        ("cash", "d"),
+        ("daily_pnl", "d"),
+    ),
+    "positions": (
+        ("time", "q"),
+        ("symbol", "s"),
+        ("quantity", "q"),
+        ("avg_price", "d"),
+        ("last_price", "d"),
+        ("stop_price", "d"),
+        ("take_profit", "d"),
+    ),
+}
+
+_MAGIC = b"VTCOL1\n"
+_NAN = float("nan")
+
+
+class ResultSink(ABC):
+    def __init__(self, chunk_rows: int = 10_000):
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+        self.chunk_rows = chunk_rows
+        self._buffers: Dict[str, List[tuple]] = {name: [] for name in SCHEMAS}
+        self._chunks: Dict[str, int] = {name: 0 for name in SCHEMAS}
+
+    def write_trade(self, trade: Trade) -> None:
+        self._append("trades", (
+            trade.symbol or "",
+            trade.entry_time or 0,
+            trade.exit_time or 0,
+            trade.pnl,
+            trade.duration_bars,
+            trade.time_in_drawdown_bars,
+            int(trade.adhered_to_plan),
+        ))
+
+    def write_fill(self, fill: Fill) -> None:
+        order = fill.order
+        self._append("fills", (fill.time, order.symbol, order.side.name, order.order_type.name, fill.filled_qty, fill.price))
+
+    def write_equity(self, time: int, equity: float, cash: float, daily_pnl: float) -> None:
+        self._append("equity", (time, equity, cash, daily_pnl))
+
+    def write_position(self, time: int, pos: Position) -> None:
+        self._append("positions", (
+            time,
+            pos.symbol,
+            pos.quantity,
+            pos.avg_price,
+            pos.last_price if pos.last_price is not None else _NAN,
+            pos.stop_price if pos.stop_price is not None else _NAN,
+            pos.take_profit if pos.take_profit is not None else _NAN,
+        ))
+
+    def flush(self) -> None:
+        for table in self._buffers:
+            self._flush_table(table)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _append(self, table: str, row: tuple) -> None:
+        rows = self._buffers[table]
+        rows.append(row)
+        if len(rows) >= self.chunk_rows:
+            self._flush_table(table)
+
+    def _flush_table(self, table: str) -> None:
+        rows = self._buffers[table]
+        if not rows:
+            return
+        self._write_chunk(table, self._chunks[table], rows)
+        self._chunks[table] += 1
+        self._buffers[table] = []
+
+    @abstractmethod
+    def _write_chunk(self, table: str, index: int, rows: List[tuple]) -> None:
+        ...
+
+
+def _clear_chunks(directory: str) -> None:
+    # Chunks are numbered from 0 on every run, so a reused directory would otherwise
+    # mix the previous run's later chunks into this one's tables
+    for name in os.listdir(directory):
+        table, _, rest = name.partition("-")
+        index, _, ext = rest.partition(".")
+        if table in SCHEMAS and len(index) == 5 and index.isdigit() and ext in ("csv", "col"):
+            os.remove(os.path.join(directory, name))
+
+
+class CsvSink(ResultSink):
+    def __init__(self, directory: str, chunk_rows: int = 10_000):
+        super().__init__(chunk_rows)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        _clear_chunks(directory)
+
+    def _write_chunk(self, table: str, index: int, rows: List[tuple]) -> None:
+        path = os.path.join(self.directory, f"{table}-{index:05d}.csv")
+        with open(path, "w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow([name for name, _ in SCHEMAS[table]])
+            writer.writerows(rows)
+
+
+class ColumnarSink(ResultSink):
+    # Each chunk file: magic, header length, JSON header, then one contiguous buffer per
+    # column. String columns are stored Arrow-style as int64 end offsets plus UTF-8 bytes.
+    def __init__(self, directory: str, chunk_rows: int = 10_000):
+        super().__init__(chunk_rows)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        _clear_chunks(directory)
+
+    def _write_chunk(self, table: str, index: int, rows: List[tuple]) -> None:
+        schema = SCHEMAS[table]
+        buffers: List[bytes] = []
+        columns = []
+        for i, (name, code) in enumerate(schema):
+            values = [row[i] for row in rows]
+            if code == "s":
+                encoded = [v.encode("utf-8") for v in values]
+                offsets = array("q")
+                end = 0
+                for e in encoded:
+                    end += len(e)
+                    offsets.append(end)
+                data = offsets.tobytes() + b"".join(encoded)
+            else:
+                data = array(code, values).tobytes()
+            columns.append({"name": name, "type": code, "nbytes": len(data)})
+            buffers.append(data)
+        header = json.dumps({"table": table, "rows": len(rows), "columns": columns}).encode("utf-8")
+        path = os.path.join(self.directory, f"{table}-{index:05d}.col")
+        with open(path, "wb") as fh:
+            fh.write(_MAGIC)
+            fh.write(struct.pack("<I", len(header)))
+            fh.write(header)
+            for data in buffers:
+                fh.write(data)
+
+
+def read_columnar_chunk(path: str) -> Dict[str, Sequence]:
+    with open(path, "rb") as fh:
+        if fh.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Not a columnar result file: {path}")
+        (header_len,) = struct.unpack("<I", fh.read(4))
+        header = json.loads(fh.read(header_len).decode("utf-8"))
+        rows = header["rows"]
+        out: Dict[str, Sequence] = {}
+        for col in header["columns"]:
+            data = fh.read(col["nbytes"])
+            if col["type"] == "s":
+                offsets = array("q")
+                offsets.frombytes(data[: rows * offsets.itemsize])
+                blob = data[rows * offsets.itemsize:]
+                starts = [0] + offsets.tolist()[:-1]
+                out[col["name"]] = [blob[a:b].decode("utf-8") for a, b in zip(starts, offsets)]
+            else:
+                values = array(col["type"])
+                values.frombytes(data)
+                out[col["name"]] = values
+    return out
+
+
+def read_columnar_table(directory: str, table: str) -> Iterator[Dict[str, Sequence]]:
+    prefix = f"{table}-"
+    for name in sorted(os.listdir(directory)):
+        if name.startswith(prefix) and name.endswith(".col"):
+            yield read_columnar_chunk(os.path.join(directory, name))
+
+
+def open_sink(directory: str, fmt: str = "csv", chunk_rows: int = 10_000) -> ResultSink:
+    if fmt == "csv":
+        return CsvSink(directory, chunk_rows)
+    if fmt == "columnar":
+        return ColumnarSink(directory, chunk_rows)
+    raise ValueError(f"Unknown sink format: {fmt}")
@@ -0,0 +1,182 @@
+from __future__ import annotations
+import random
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from math import exp, sqrt
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from .data import BarColumns
+from .config import TRADING_SCHEDULE
+
+try:
+    import numpy as np
+except ImportError:  # optional; without it paths are generated session by session below
+    np = None
+
+SESSION_OPEN_ET = time(9, 30)
+SESSION_CLOSE_ET = time(16, 0)
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    start: str = "2023-01-03"
+    days: int = 20
+    bar_seconds: int = 60
+    annual_vol: float = 0.40
+    annual_drift: float = 0.05
+    # Daily Markov switching between volatility regimes (multipliers on annual_vol)
+    regimes: Tuple[float, ...] = (0.6, 1.0, 2.5)
+    regime_switch_prob: float = 0.05
+    overnight_gap_vol: float = 0.015
+    spike_prob: float = 0.002
+    spike_multiplier: float = 6.0
+    bar_volume: float = 20_000.0
+    min_price: float = 10.0
+    max_price: float = 200.0
+
+
+def trading_sessions(start: str, days: int, tz: str = TRADING_SCHEDULE.get("timezone", "US/Eastern")) -> List[Tuple[int, int]]:
+    # Weekday sessions as (open, close) epoch seconds; exchange holidays are not modelled
+    zone = ZoneInfo(tz)
+    sessions: List[Tuple[int, int]] = []
+    day = date.fromisoformat(start)
+    while len(sessions) < days:
+        if day.weekday() < 5:
+            open_ = int(datetime.combine(day, SESSION_OPEN_ET, tzinfo=zone).timestamp())
+            close = int(datetime.combine(day, SESSION_CLOSE_ET, tzinfo=zone).timestamp())
+            sessions.append((open_, close))
+        day += timedelta(days=1)
+    return sessions
+
+
+def _volume_profile(bars_per_session: int) -> List[float]:
+    # U-shaped intraday volume: heavy at the open and close, quiet at midday
+    if bars_per_session <= 1:
+        return [1.0] * bars_per_session
+    mid = (bars_per_session - 1) / 2
+    return [0.5 + 1.5 * ((i - mid) / mid) ** 2 for i in range(bars_per_session)]
+
+
+def generate_symbol(
+    symbol: str,
+    spec: SyntheticSpec,
+    seed: int = 0,
+    sessions: Optional[List[Tuple[int, int]]] = None,
+) -> BarColumns:
+    # String seeds are hashed deterministically, so each symbol gets its own stable stream
+    rng = random.Random(f"{seed}:{symbol}")
+    gauss = rng.gauss
+    sessions = sessions if sessions is not None else trading_sessions(spec.start, spec.days)
+    per_session = (sessions[0][1] - sessions[0][0]) // spec.bar_seconds if sessions else 0
+    offsets = [i * spec.bar_seconds for i in range(per_session)]
+    profile = _volume_profile(per_session)
+    bars_per_year = 252 * per_session
+    dt_vol = spec.annual_vol / sqrt(bars_per_year) if bars_per_year else 0.0
+    dt_drift = spec.annual_drift / bars_per_year if bars_per_year else 0.0
+    if np is not None and per_session:
+        # Seeded from `rng`, so a seed still fixes the paths for a given backend
+        gen = np.random.default_rng(rng.getrandbits(64))
+        return _generate_np(symbol, spec, gen, sessions, offsets, profile, dt_vol, dt_drift)
+
+    cols = BarColumns(symbol=symbol)
+    price = rng.uniform(spec.min_price, spec.max_price)
+    regime = rng.randrange(len(spec.regimes))
+    for open_time, _ in sessions:
+        if rng.random() < spec.regime_switch_prob:
+            regime = rng.randrange(len(spec.regimes))
+        vol = dt_vol * spec.regimes[regime]
+        mu = dt_drift - 0.5 * vol * vol
+        session_open = price * exp(gauss(0.0, spec.overnight_gap_vol))
+
+        # GBM path for the whole session from cumulative log-returns
+        log_path = accumulate([mu + vol * gauss(0.0, 1.0) for _ in offsets])
+        closes = [session_open * exp(x) for x in log_path]
+        opens = [session_open] + closes[:-1]
+        upper = [abs(gauss(0.0, vol)) for _ in offsets]
+        lower = [abs(gauss(0.0, vol)) for _ in offsets]
+        highs = [max(o, c) * (1 + w) for o, c, w in zip(opens, closes, upper)]
+        lows = [min(o, c) * (1 - w) for o, c, w in zip(opens, closes, lower)]
+        volumes = [
+            round(spec.bar_volume * p * rng.lognormvariate(0.0, 0.3) * (spec.spike_multiplier if rng.random() < spec.spike_prob else 1.0))
+            for p in profile
+        ]
+
+        cols.time.extend([open_time + off for off in offsets])
+        cols.open.extend(opens)
+        cols.high.extend(highs)
+        cols.low.extend(lows)
+        cols.close.extend(closes)
+        cols.volume.extend(volumes)
+        price = closes[-1] if closes else price
+    return cols
+
+
+def _generate_np(
+    symbol: str,
+    spec: SyntheticSpec,
+    gen,
+    sessions: List[Tuple[int, int]],
+    offsets: List[int],
+    profile: List[float],
+    dt_vol: float,
+    dt_drift: float,
+) -> BarColumns:
+    # The model of generate_symbol drawn for every session at once, one row per session
+    days, per = len(sessions), len(offsets)
+    price = gen.uniform(spec.min_price, spec.max_price)
+    regimes = np.asarray(spec.regimes)
+    first = gen.integers(len(regimes))
+    # Each session keeps the regime picked at the latest switch, or the initial one
+    switched = gen.random(days) < spec.regime_switch_prob
+    picks = gen.integers(len(regimes), size=days)
+    latest = np.maximum.accumulate(np.where(switched, np.arange(days), -1))
+    regime = np.where(latest >= 0, picks[np.maximum(latest, 0)], first)
+    vol = (dt_vol * regimes[regime])[:, None]
+    steps = (dt_drift - 0.5 * vol * vol) + vol * gen.standard_normal((days, per))
+    gaps = gen.normal(0.0, spec.overnight_gap_vol, size=days)
+    # Log closes of the whole path; each session's first step also carries the overnight gap
+    increments = steps.copy()
+    increments[:, 0] += gaps
+    log_close = (np.log(price) + np.cumsum(increments)).reshape(days, per)
+    closes = np.exp(log_close)
+    opens = np.empty_like(closes)
+    opens.ravel()[1:] = closes.ravel()[:-1]
+    opens[:, 0] = np.exp(log_close[:, 0] - steps[:, 0])
+    upper = np.abs(vol * gen.standard_normal((days, per)))
+    lower = np.abs(vol * gen.standard_normal((days, per)))
+    highs = np.maximum(opens, closes) * (1 + upper)
+    lows = np.minimum(opens, closes) * (1 - lower)
+    spikes = np.where(gen.random((days, per)) < spec.spike_prob, spec.spike_multiplier, 1.0)
+    volumes = np.round(spec.bar_volume * np.asarray(profile) * gen.lognormal(0.0, 0.3, (days, per)) * spikes)
+    times = np.asarray([open_ for open_, _ in sessions], dtype=np.int64)[:, None] + np.asarray(offsets, dtype=np.int64)
+    return BarColumns(
+        symbol=symbol,
+        time=_column("q", times),
+        open=_column("d", opens),
+        high=_column("d", highs),
+        low=_column("d", lows),
+        close=_column("d", closes),
+        volume=_column("d", volumes),
+    )
+
+
+def _column(typecode: str, values) -> array:
+    out = array(typecode)
+    out.frombytes(np.ascontiguousarray(values, dtype=np.int64 if typecode == "q" else np.float64).tobytes())
+    return out
+
+
+def generate_market(
+    symbols: Iterable[str],
+    spec: SyntheticSpec = SyntheticSpec(),
+    seed: int = 0,
+) -> Dict[str, BarColumns]:
+    sessions = trading_sessions(spec.start, spec.days)
+    return {symbol: generate_symbol(symbol, spec, seed, sessions) for symbol in symbols}
+
+
+def synthetic_symbols(count: int) -> List[str]:
+    return [f"SYN{i:05d}" for i in range(count)]